@@ -13,6 +13,7 @@ from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import logging
 import structlog
 import os
 from dotenv import load_dotenv
@@ -21,11 +22,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Configure structured logging
+# Calls below LOG_LEVEL are no-ops, so per-turn debug logs cost nothing in production
 structlog.configure(
     processors=[
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.JSONRenderer()
-    ]
+    ],
+    wrapper_class=structlog.make_filtering_bound_logger(
+        getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+    ),
+    cache_logger_on_first_use=True
 )
 logger = structlog.get_logger()
 
@@ -50,6 +56,10 @@ async def lifespan(app: FastAPI):
     
     yield
     
+    # Write any buffered conversation logs before exiting
+    from services.conversation_service import close_conversation_service
+    await close_conversation_service()
+    
     logger.info("application_shutdown")
 
 
@@ -36,6 +36,11 @@ class MessageRole(str, Enum):
     SYSTEM = "system"
 
 
+# Roles whose messages ask the user something; str-valued members hash like
+# their values, so both MessageRole members and raw role strings match
+QUESTION_ROLES = frozenset({MessageRole.ASSISTANT, MessageRole.SYSTEM})
+
+
 class Message(BaseModel):
     """Individual message in a conversation."""
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -68,6 +73,9 @@ class Question(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
+        # Questions are never mutated after creation; freezing makes cached
+        # or batched instances safe to share between callers
+        frozen = True
         json_schema_extra = {
             "example": {
                 "id": "q-123",
@@ -110,6 +118,7 @@ class Session(BaseModel):
     provider: Optional[str] = None
     model_id: Optional[str] = None
     skipped_questions: List[str] = Field(default_factory=list)  # Track skipped question IDs
+    question_count: int = 0  # Assistant/system messages, counted as they are added
 
     class Config:
         json_schema_extra = {
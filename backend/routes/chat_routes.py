@@ -505,7 +505,8 @@ async def edit_answer(
 @router.websocket("/ws/{session_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
-    session_id: str
+    session_id: str,
+    conversation: ConversationService = Depends(get_conversation_service)
 ):
     """
     WebSocket endpoint for real-time streaming responses.
@@ -517,6 +518,7 @@ async def websocket_endpoint(
     Args:
         websocket: WebSocket connection
         session_id: Session identifier
+        conversation: ConversationService dependency
         
     Protocol:
         Client sends: {"message": "user's answer"}
@@ -530,10 +532,6 @@ async def websocket_endpoint(
     logger.info("websocket_connected", session_id=session_id)
     
     try:
-        # Get conversation service
-        # Note: Can't use Depends() in WebSocket, so create manually
-        conversation = get_conversation_service()
-        
         # Verify session exists
         session = conversation.get_session(session_id)
         if session is None:
@@ -412,15 +412,9 @@ async def delete_token(
         )
     
     try:
-        # Delete token by directly removing from env (bypass validation)
-        import os
-        from dotenv import set_key, unset_key
+        # Delete token by directly removing it from storage (bypass validation)
         env_var = f"{provider.upper()}_API_KEY"
-        env_file = config.env_file
-        
-        # Remove from environment
-        if os.path.exists(env_file):
-            unset_key(env_file, env_var)
+        config.backend.unset(env_var)
         
         logger.info("token_deleted_successfully", provider=provider)
         return None
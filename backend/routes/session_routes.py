@@ -5,6 +5,7 @@ This module provides REST API endpoints for:
 - Manual session saving
 - Session loading/restoration
 - Session listing with pagination
+- Session export as a JSON document
 - Session deletion
 
 SOLID Principles:
@@ -13,7 +14,7 @@ SOLID Principles:
 - Dependency Inversion: Depends on ConversationService abstraction
 """
 
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 import structlog
@@ -388,6 +389,85 @@ async def list_sessions(
         )
 
 
+@router.get("/export/{session_id}", status_code=status.HTTP_200_OK)
+async def export_session(
+    session_id: str,
+    conversation: ConversationService = Depends(get_conversation_service)
+) -> Response:
+    """
+    Export a saved session as a downloadable JSON document.
+    
+    The export is indented and embeds the session's messages, so it can
+    be shared or inspected on its own.
+    
+    Args:
+        session_id: ID of session to export
+        conversation: ConversationService dependency
+        
+    Returns:
+        JSON attachment with the session and its messages
+        
+    Raises:
+        404: Session not found
+        500: Export operation failed
+        
+    Example:
+        GET /api/session/export/abc-123
+        
+        Response:
+        {
+          "id": "abc-123",
+          ...
+          "messages": [...]
+        }
+    """
+    logger.info("api_export_session", session_id=session_id)
+    
+    try:
+        # Check if session service is available
+        if not conversation.session_svc:
+            logger.warning("session_service_not_available")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Session service not available"
+            )
+        
+        # Persist in-memory progress so the export is current
+        if conversation.get_session(session_id):
+            await conversation.manual_save_session(session_id)
+        
+        content = await conversation.session_svc.export_session(session_id)
+        
+        if content is None:
+            logger.warning("session_not_found_for_export", session_id=session_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Session not found: {session_id}"
+            )
+        
+        return Response(
+            content=content,
+            media_type="application/json",
+            headers={
+                "Content-Disposition": f'attachment; filename="session-{session_id}.json"'
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(
+            "export_session_error",
+            session_id=session_id,
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export session: {str(e)}"
+        )
+
+
 @router.delete("/{session_id}", response_model=DeleteSessionResponse, status_code=status.HTTP_200_OK)
 async def delete_session(
     session_id: str,
@@ -441,13 +521,8 @@ async def delete_session(
                 detail=f"Session not found: {session_id}"
             )
         
-        # Remove from active sessions if present
-        if session_id in conversation.sessions:
-            del conversation.sessions[session_id]
-        if session_id in conversation.messages:
-            del conversation.messages[session_id]
-        if session_id in conversation.last_save_counts:
-            del conversation.last_save_counts[session_id]
+        # Remove from active sessions (and cached prompt history) if present
+        conversation.forget_session(session_id)
         
         logger.info("session_deleted_via_api", session_id=session_id)
         
@@ -5,7 +5,7 @@ This service handles:
 - API token encryption/decryption
 - Provider selection (Groq/OpenAI)
 - Token format validation
-- Persistent storage in .env file
+- Persistent storage in .env file (or an in-memory backend for tests)
 
 SOLID Principles:
 - Single Responsibility: Manages only configuration
@@ -14,42 +14,122 @@ SOLID Principles:
 """
 
 from cryptography.fernet import Fernet
+import functools
 import os
 import re
-from typing import Optional
-from dotenv import load_dotenv, set_key, find_dotenv
+import tempfile
+from typing import Dict, Optional, Tuple
+from dotenv import load_dotenv, unset_key, find_dotenv
+from dotenv.parser import parse_stream
 import structlog
 
 logger = structlog.get_logger()
 
+# Token shapes per provider: a literal prefix (checked first, so most
+# rejects never reach the regex) and a pattern for a token longer than 20
+# characters. Groq tokens start with 'gsk_'; OpenAI tokens with 'sk-'
+# (which also covers 'sk-proj-' project keys).
+_TOKEN_PREFIXES = {
+    "groq": "gsk_",
+    "openai": "sk-",
+}
+_TOKEN_PATTERNS = {
+    "groq": re.compile(r"gsk_.{17,}", re.DOTALL),
+    "openai": re.compile(r"sk-.{18,}", re.DOTALL),
+}
 
-class ConfigService:
+def _env_line(key: str, value: str) -> str:
+    """Format a setting the way dotenv's set_key does (always quoted)."""
+    return "{}='{}'\n".format(key, value.replace("'", "\\'"))
+
+
+@functools.lru_cache(maxsize=4)
+def _fernet_for(key: bytes) -> Fernet:
     """
-    Service for managing API configuration including token storage and provider selection.
+    Return the Fernet cipher for a key, built once per process.
     
-    Implements secure token storage with encryption and provides validation
-    for different provider token formats.
+    Building a Fernet decodes and splits the key; routes construct a
+    ConfigService per request, so they share the cipher instead.
     """
+    return Fernet(key)
+
+
+class DotenvBackend:
+    """Settings storage backed by a .env file (the default)."""
     
-    def __init__(self, env_file: str = ".env"):
+    # Process environment as of the last load, shared by every DotenvBackend:
+    # they all load into the one os.environ, so a long-lived ConfigService
+    # (e.g. LLMService's) sees saves made through the per-request ones
+    _env: Dict[str, str] = {}
+    
+    def __init__(self, env_file: str):
         """
-        Initialize the configuration service.
-        
         Args:
-            env_file: Path to the .env file for persistent storage
+            env_file: Path to the .env file
         """
         self.env_file = env_file
-        self.encryption_key = self._get_or_create_key()
-        self.cipher = Fernet(self.encryption_key)
+    
+    def set(self, key: str, value: str) -> None:
+        """Write a setting to the file, creating it if needed."""
+        self.set_many({key: value})
+    
+    def set_many(self, values: Dict[str, str]) -> None:
+        """
+        Write several settings with one read and one write of the file.
         
-        # Load dotenv with override to ensure we use the specified file
-        load_dotenv(self.env_file, override=True)
+        Existing keys are replaced in place and new ones appended, as
+        dotenv's set_key would; the new contents go to a uniquely named
+        temporary file beside it (created 0600, like set_key's, since the
+        file holds API tokens) that is fsync'd and then renamed over the
+        original.
         
-        logger.info("config_service_initialized", env_file=env_file)
+        Args:
+            values: Settings to write
+        """
+        pending = dict(values)
+        lines = []
+        if os.path.exists(self.env_file):
+            with open(self.env_file, encoding="utf-8") as source:
+                for binding in parse_stream(source):
+                    if binding.key in values:
+                        lines.append(_env_line(binding.key, values[binding.key]))
+                        pending.pop(binding.key, None)
+                    else:
+                        lines.append(binding.original.string)
+        if pending and lines and not lines[-1].endswith("\n"):
+            lines.append("\n")
+        lines.extend(_env_line(key, value) for key, value in pending.items())
+        
+        env_dir = os.path.dirname(os.path.abspath(self.env_file))
+        fd, tmp_path = tempfile.mkstemp(dir=env_dir, prefix=".env.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as dest:
+                dest.write("".join(lines))
+                dest.flush()
+                os.fsync(dest.fileno())
+            os.replace(tmp_path, self.env_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def unset(self, key: str) -> None:
+        """Remove a setting from the file, if the file exists."""
+        if os.path.exists(self.env_file):
+            unset_key(self.env_file, key)
     
-    def _get_or_create_key(self) -> bytes:
+    @property
+    def env(self) -> Dict[str, str]:
+        """Settings as of the last load (a snapshot of os.environ)."""
+        return DotenvBackend._env
+    
+    def load(self) -> None:
+        """Load the file's settings into the process environment."""
+        load_dotenv(self.env_file, override=True)
+        DotenvBackend._env = dict(os.environ)
+    
+    def load_key(self) -> bytes:
         """
-        Get existing encryption key or create a new one.
+        Get the encryption key from .encryption_key, creating it if needed.
         
         Returns:
             Encryption key as bytes
@@ -65,6 +145,76 @@ class ConfigService:
                 f.write(key)
             logger.info("encryption_key_created")
             return key
+
+
+class InMemoryEnvBackend:
+    """
+    Settings storage backed by a dict, for tests that don't need persistence.
+    
+    Mirrors DotenvBackend without touching the filesystem or the process
+    environment: settings and the encryption key live only in this object.
+    """
+    
+    def __init__(self, values: Optional[Dict[str, str]] = None, key: Optional[bytes] = None):
+        """
+        Args:
+            values: Initial settings
+            key: Fernet key; a fresh one is generated if omitted
+        """
+        self.values: Dict[str, str] = dict(values or {})
+        self.key = key if key is not None else Fernet.generate_key()
+        self.env: Dict[str, str] = {}
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a setting."""
+        self.values[key] = value
+    
+    def set_many(self, values: Dict[str, str]) -> None:
+        """Store several settings."""
+        self.values.update(values)
+    
+    def unset(self, key: str) -> None:
+        """Remove a setting if present."""
+        self.values.pop(key, None)
+    
+    def load(self) -> None:
+        """Take a snapshot of the stored settings for reads."""
+        self.env = dict(self.values)
+    
+    def load_key(self) -> bytes:
+        """Return the in-memory encryption key."""
+        return self.key
+
+
+class ConfigService:
+    """
+    Service for managing API configuration including token storage and provider selection.
+    
+    Implements secure token storage with encryption and provides validation
+    for different provider token formats.
+    """
+    
+    def __init__(self, env_file: str = ".env", backend=None):
+        """
+        Initialize the configuration service.
+        
+        Args:
+            env_file: Path to the .env file for persistent storage
+            backend: Settings storage (DotenvBackend or InMemoryEnvBackend);
+                defaults to a DotenvBackend on env_file
+        """
+        self.env_file = env_file
+        self.backend = backend if backend is not None else DotenvBackend(env_file)
+        self.encryption_key = self.backend.load_key()
+        self.cipher = _fernet_for(self.encryption_key)
+        # provider -> (stored value, decrypted token); reused while the
+        # stored value is unchanged, so Fernet runs once per token
+        self._token_cache: Dict[str, Tuple[str, str]] = {}
+        
+        # Load with override to ensure we use the specified settings
+        self.backend.load()
+        
+        logger.info("config_service_initialized", env_file=env_file)
     
     def save_token(self, provider: str, token: str) -> bool:
         """
@@ -95,21 +245,16 @@ class ConfigService:
             # Determine environment variable name
             env_var = f"{provider.upper()}_API_KEY"
             
-            # Use the configured env_file
-            env_path = self.env_file
-            
-            # Ensure the file exists
-            if not os.path.exists(env_path):
-                open(env_path, 'a').close()
-            
-            # Save to .env file
-            set_key(env_path, env_var, encrypted_token)
-            
-            # Also update active provider
-            set_key(env_path, "ACTIVE_PROVIDER", provider)
+            # Save the token and make its provider active in one write
+            # to the settings backend (.env file by default)
+            self.backend.set_many({
+                env_var: encrypted_token,
+                "ACTIVE_PROVIDER": provider
+            })
             
             # Reload environment to pick up changes
-            load_dotenv(env_path, override=True)
+            self.backend.load()
+            self._token_cache[provider] = (encrypted_token, token)
             
             logger.info("token_saved", provider=provider, env_var=env_var)
             return True
@@ -134,21 +279,27 @@ class ConfigService:
         
         try:
             env_var = f"{provider.upper()}_API_KEY"
-            encrypted_token = os.getenv(env_var)
+            encrypted_token = self.backend.env.get(env_var)
             
             if not encrypted_token:
                 logger.warning("token_not_found", provider=provider)
                 return None
             
+            cached = self._token_cache.get(provider)
+            if cached is not None and cached[0] == encrypted_token:
+                return cached[1]
+            
             # Try to decrypt (if it's encrypted)
             try:
                 decrypted_token = self.cipher.decrypt(encrypted_token.encode()).decode()
                 logger.info("token_retrieved", provider=provider)
-                return decrypted_token
             except Exception:
                 # Token might not be encrypted (for backwards compatibility)
                 logger.info("token_retrieved_unencrypted", provider=provider)
-                return encrypted_token
+                decrypted_token = encrypted_token
+            
+            self._token_cache[provider] = (encrypted_token, decrypted_token)
+            return decrypted_token
                 
         except Exception as e:
             logger.error("token_retrieval_failed", provider=provider, error=str(e))
@@ -165,27 +316,21 @@ class ConfigService:
         Returns:
             True if token format is valid, False otherwise
         """
-        if not token or not token.strip():
+        token = (token or "").strip()
+        if not token:
             logger.warning("empty_token_validation", provider=provider)
             return False
         
-        token = token.strip()
-        
-        if provider == "groq":
-            # Groq tokens typically start with 'gsk_'
-            if token.startswith("gsk_") and len(token) > 20:
-                return True
-            logger.warning("invalid_groq_token_format", token_prefix=token[:4])
-            return False
-            
-        elif provider == "openai":
-            # OpenAI tokens start with 'sk-' (or 'sk-proj-' for project keys)
-            if (token.startswith("sk-") or token.startswith("sk-proj-")) and len(token) > 20:
-                return True
-            logger.warning("invalid_openai_token_format", token_prefix=token[:7])
+        pattern = _TOKEN_PATTERNS.get(provider)
+        if pattern is None:
+            logger.error("unsupported_provider_validation", provider=provider)
             return False
         
-        logger.error("unsupported_provider_validation", provider=provider)
+        prefix = _TOKEN_PREFIXES[provider]
+        if token.startswith(prefix) and pattern.fullmatch(token):
+            return True
+        
+        logger.warning(f"invalid_{provider}_token_format", token_prefix=token[:len(prefix)])
         return False
     
     def switch_provider(self, new_provider: str) -> bool:
@@ -210,16 +355,10 @@ class ConfigService:
                 return False
             
             # Update active provider
-            env_path = self.env_file
-            
-            # Ensure the file exists
-            if not os.path.exists(env_path):
-                open(env_path, 'a').close()
-            
-            set_key(env_path, "ACTIVE_PROVIDER", new_provider)
+            self.backend.set("ACTIVE_PROVIDER", new_provider)
             
             # Reload environment to pick up changes
-            load_dotenv(env_path, override=True)
+            self.backend.load()
             
             logger.info("provider_switched", new_provider=new_provider)
             return True
@@ -235,7 +374,9 @@ class ConfigService:
         Returns:
             Active provider name or None
         """
-        provider = os.getenv("ACTIVE_PROVIDER", os.getenv("DEFAULT_PROVIDER", "groq"))
+        provider = self.backend.env.get("ACTIVE_PROVIDER")
+        if provider is None:
+            provider = self.backend.env.get("DEFAULT_PROVIDER", "groq")
         logger.info("active_provider_retrieved", provider=provider)
         return provider
     
@@ -253,7 +394,7 @@ class ConfigService:
             provider = self.get_active_provider()
         
         env_var = f"{provider.upper()}_SELECTED_MODEL"
-        model = os.getenv(env_var)
+        model = self.backend.env.get(env_var)
         
         if model:
             logger.info("selected_model_retrieved", provider=provider, model=model)
@@ -285,16 +426,10 @@ class ConfigService:
         
         try:
             env_var = f"{provider.upper()}_SELECTED_MODEL"
-            env_path = self.env_file
-            
-            # Ensure the file exists
-            if not os.path.exists(env_path):
-                open(env_path, 'a').close()
-            
-            set_key(env_path, env_var, model_id)
+            self.backend.set(env_var, model_id)
             
             # Reload environment to pick up changes
-            load_dotenv(env_path, override=True)
+            self.backend.load()
             
             logger.info("model_saved", provider=provider, model_id=model_id)
             return True
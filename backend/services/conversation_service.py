@@ -14,7 +14,9 @@ SOLID Principles:
 - Dependency Inversion: Depends on LLMService abstraction
 """
 
+import threading
 import uuid
+from types import MappingProxyType
 from typing import List, Optional, Dict, Tuple
 from datetime import datetime
 import structlog
@@ -24,7 +26,8 @@ from models.conversation import (
     Message,
     Question,
     MessageRole,
-    ConversationState
+    ConversationState,
+    QUESTION_ROLES
 )
 from services.llm_service import LLMService
 from services.rag_service import RAGService
@@ -33,6 +36,26 @@ from services.session_service import SessionService
 
 logger = structlog.get_logger()
 
+# Answers with fewer words than this get a follow-up question
+_FOLLOWUP_MIN_WORDS = 15
+
+
+def _update_session(session: Session, **fields) -> None:
+    """
+    Assign Session fields without going through BaseModel.__setattr__.
+    
+    Session doesn't validate assignments, so pydantic's __setattr__ only
+    stores the value and marks the field set; its checks on the way there
+    cost ~4 µs per field, on every turn. This does the same two steps
+    directly. Only use it for declared fields.
+    
+    Args:
+        session: Session to update
+        **fields: Field names and their new values
+    """
+    session.__dict__.update(fields)
+    session.__pydantic_fields_set__.update(fields)
+
 
 class ConversationService:
     """
@@ -55,6 +78,9 @@ class ConversationService:
         ConversationState.COMPLETE
     ]
     
+    # Precomputed transitions; COMPLETE has no successor
+    _NEXT_STATE = MappingProxyType(dict(zip(STATE_ORDER, STATE_ORDER[1:])))
+    
     # Question templates by category
     QUESTION_TEMPLATES = {
         ConversationState.FUNCTIONALITY: [
@@ -93,6 +119,13 @@ class ConversationService:
         ]
     }
     
+    # Text asked for each category: the first template, resolved once
+    _CATEGORY_QUESTION_TEXT = MappingProxyType({
+        state: templates[0]
+        for state, templates in QUESTION_TEMPLATES.items()
+        if templates
+    })
+    
     def __init__(
         self,
         llm_service: LLMService,
@@ -115,6 +148,9 @@ class ConversationService:
         self.session_svc = session_service
         self.sessions: Dict[str, Session] = {}
         self.messages: Dict[str, List[Message]] = {}
+        # session_id -> role -> that role's messages, in order; kept in step
+        # with self.messages so per-role lookups don't scan the history
+        self._messages_by_role: Dict[str, Dict[MessageRole, List[Message]]] = {}
         self.last_save_counts: Dict[str, int] = {}  # Track interaction count at last save
         
         logger.info(
@@ -145,10 +181,11 @@ class ConversationService:
         session_id = str(uuid.uuid4())
         
         # Create session
+        now = datetime.utcnow()
         session = Session(
             id=session_id,
-            started_at=datetime.utcnow(),
-            last_updated=datetime.utcnow(),
+            started_at=now,
+            last_updated=now,
             status="active",
             state=ConversationState.START,
             investigation_progress={},
@@ -199,14 +236,7 @@ class ConversationService:
             return question
         
         # Fallback to template-based question
-        question = Question(
-            id=str(uuid.uuid4()),
-            category=ConversationState.FUNCTIONALITY.value,
-            text=self.QUESTION_TEMPLATES[ConversationState.FUNCTIONALITY][0],
-            context=[],
-            is_followup=False,
-            timestamp=datetime.utcnow()
-        )
+        question = self._generate_category_question(ConversationState.FUNCTIONALITY)
         
         logger.info(
             "initial_question_generated",
@@ -248,15 +278,15 @@ class ConversationService:
         )
         
         # Add user message to history
-        self._add_message(
+        message = self._add_message(
             session_id=session_id,
             role=MessageRole.USER,
             content=answer_text,
             metadata={"state": session.state.value}
         )
         
-        # Update session timestamp
-        session.last_updated = datetime.utcnow()
+        # Update session timestamp (the answer's own, saving a clock read)
+        _update_session(session, last_updated=message.timestamp)
         
         # Get the current question (last assistant message)
         current_question = None
@@ -288,10 +318,11 @@ class ConversationService:
         context_chunks = []
         if self.rag:
             try:
-                context_chunks = self.rag.retrieve_context(
+                context_chunks = await self.rag.retrieve_context(
                     query=answer_text,
                     session_id=session_id,
-                    top_k=5
+                    top_k=5,
+                    recall_mode="fast"
                 )
                 logger.info(
                     "rag_context_retrieved",
@@ -307,8 +338,10 @@ class ConversationService:
         
         # Build a short history summary for the meta‑prompt
         recent_msgs = self.messages.get(session_id, [])[-6:]
+        # Message.role is validated to MessageRole, a str enum, so a plain
+        # string comparison is enough
         history_summary = "\n".join([
-            f"{'Q' if (hasattr(msg.role, 'value') and msg.role.value == 'assistant') or msg.role == 'assistant' else 'A'}: {msg.content}"
+            f"{'Q' if msg.role == 'assistant' else 'A'}: {msg.content}"
             for msg in recent_msgs
         ])
 
@@ -355,9 +388,9 @@ class ConversationService:
             
             # Check if investigation is complete
             if next_question is None:
-                session.state = ConversationState.COMPLETE
-                session.status = "complete"
+                _update_session(session, state=ConversationState.COMPLETE, status="complete")
                 logger.info("investigation_complete", session_id=session_id)
+                await self._flush_conversation_log(session_id)
                 return None
             
             # Update session state based on question
@@ -380,13 +413,13 @@ class ConversationService:
                 
                 if next_state == ConversationState.COMPLETE:
                     # Investigation complete
-                    session.state = ConversationState.COMPLETE
-                    session.status = "complete"
+                    _update_session(session, state=ConversationState.COMPLETE, status="complete")
                     logger.info("investigation_complete", session_id=session_id)
+                    await self._flush_conversation_log(session_id)
                     return None
                 
                 # Update session state
-                session.state = next_state
+                _update_session(session, state=next_state)
                 
                 # Update progress
                 if next_state.value not in session.investigation_progress:
@@ -438,6 +471,35 @@ class ConversationService:
         
         return self.messages[session_id]
     
+    def get_messages_by_role(self, session_id: str, role: MessageRole) -> List[Message]:
+        """
+        Get a session's messages from one role, without scanning its history.
+        
+        Args:
+            session_id: Session identifier
+            role: Message role to select
+            
+        Returns:
+            Messages from that role in chronological order (empty if none)
+        """
+        return self._messages_by_role.get(session_id, {}).get(role, [])
+    
+    def forget_session(self, session_id: str) -> None:
+        """
+        Drop all in-memory state held for a session.
+        
+        Used when a session is deleted; saved files are not touched.
+        
+        Args:
+            session_id: Session identifier
+        """
+        self.sessions.pop(session_id, None)
+        self.messages.pop(session_id, None)
+        self._messages_by_role.pop(session_id, None)
+        self.last_save_counts.pop(session_id, None)
+        if self.question_gen:
+            self.question_gen.forget_history(session_id)
+    
     def get_session(self, session_id: str) -> Optional[Session]:
         """
         Get session metadata.
@@ -472,7 +534,7 @@ class ConversationService:
         role: MessageRole,
         content: str,
         metadata: Optional[Dict] = None
-    ):
+    ) -> Message:
         """
         Add a message to the conversation history.
         
@@ -481,6 +543,9 @@ class ConversationService:
             role: Message role (user, assistant, system)
             content: Message content
             metadata: Optional metadata
+            
+        Returns:
+            The stored message
         """
         message = Message(
             id=str(uuid.uuid4()),
@@ -495,6 +560,16 @@ class ConversationService:
             self.messages[session_id] = []
         
         self.messages[session_id].append(message)
+        self._messages_by_role.setdefault(session_id, {}).setdefault(role, []).append(message)
+        
+        if role in QUESTION_ROLES and session_id in self.sessions:
+            session = self.sessions[session_id]
+            _update_session(session, question_count=session.question_count + 1)
+        
+        if self.question_gen:
+            self.question_gen.record_message(session_id, role, content)
+        
+        return message
     
     def _needs_followup(self, answer: str) -> bool:
         """
@@ -508,10 +583,10 @@ class ConversationService:
         Returns:
             True if follow-up needed, False otherwise
         """
-        word_count = len(answer.split())
-        
-        # Threshold: answers with fewer than 15 words need follow-up
-        return word_count < 15
+        # Split off at most _FOLLOWUP_MIN_WORDS pieces: enough to tell a short
+        # answer from a long one without building a list of every word
+        pieces = answer.split(None, _FOLLOWUP_MIN_WORDS - 1)
+        return len(pieces) < _FOLLOWUP_MIN_WORDS
     
     async def _generate_followup_question(
         self,
@@ -590,13 +665,10 @@ The user's latest answer was brief. Generate a follow-up question to help them e
         Returns:
             Category question
         """
-        templates = self.QUESTION_TEMPLATES.get(state, [])
-        
-        if not templates:
-            question_text = "Tell me more about your product."
-        else:
-            # For now, use the first template (can be randomized or rotated)
-            question_text = templates[0]
+        # For now, always the first template (can be randomized or rotated)
+        question_text = self._CATEGORY_QUESTION_TEXT.get(
+            state, "Tell me more about your product."
+        )
         
         return Question(
             id=str(uuid.uuid4()),
@@ -617,11 +689,11 @@ The user's latest answer was brief. Generate a follow-up question to help them e
         Returns:
             Next conversation state
         """
-        try:
-            current_idx = self.STATE_ORDER.index(current_state)
-            if current_idx + 1 < len(self.STATE_ORDER):
-                return self.STATE_ORDER[current_idx + 1]
-        except ValueError:
+        next_state = self._NEXT_STATE.get(current_state)
+        if next_state is not None:
+            return next_state
+        
+        if current_state is not ConversationState.COMPLETE:
             logger.warning(
                 "invalid_state",
                 current_state=current_state.value
@@ -650,7 +722,7 @@ The user's latest answer was brief. Generate a follow-up question to help them e
         # Get current question ID from last message
         current_question_id = None
         for msg in reversed(self.messages[session_id]):
-            if msg.role in (MessageRole.ASSISTANT, MessageRole.SYSTEM):
+            if msg.role in QUESTION_ROLES:
                 current_question_id = msg.metadata.get('question_id')
                 break
         
@@ -669,14 +741,13 @@ The user's latest answer was brief. Generate a follow-up question to help them e
         next_state = self._get_next_state(session.state)
         
         if next_state == ConversationState.COMPLETE:
-            session.state = ConversationState.COMPLETE
-            session.status = "complete"
+            _update_session(session, state=ConversationState.COMPLETE, status="complete")
             logger.info("investigation_complete_after_skip", session_id=session_id)
+            await self._flush_conversation_log(session_id)
             return None
         
         # Update session state
-        session.state = next_state
-        session.last_updated = datetime.utcnow()
+        _update_session(session, state=next_state, last_updated=datetime.utcnow())
         
         # Generate next category question
         if self.question_gen:
@@ -690,9 +761,9 @@ The user's latest answer was brief. Generate a follow-up question to help them e
             
             # Check if investigation is complete
             if next_question is None:
-                session.state = ConversationState.COMPLETE
-                session.status = "complete"
+                _update_session(session, state=ConversationState.COMPLETE, status="complete")
                 logger.info("investigation_complete_from_question_gen", session_id=session_id)
+                await self._flush_conversation_log(session_id)
                 return None
         else:
             # Fallback to template-based question
@@ -762,9 +833,12 @@ The user's latest answer was brief. Generate a follow-up question to help them e
                 msg.metadata['edited_at'] = datetime.utcnow().isoformat()
                 message_found = True
                 
+                if self.question_gen:
+                    self.question_gen.forget_history(session_id)
+                
                 # Find the corresponding question (previous assistant/system message)
                 for j in range(i - 1, -1, -1):
-                    if messages[j].role in (MessageRole.ASSISTANT, MessageRole.SYSTEM):
+                    if messages[j].role in QUESTION_ROLES:
                         corresponding_question = messages[j].content
                         break
                 
@@ -812,7 +886,7 @@ The user's latest answer was brief. Generate a follow-up question to help them e
             )
         
         # Update session timestamp
-        session.last_updated = datetime.utcnow()
+        _update_session(session, last_updated=datetime.utcnow())
         
         return True
     
@@ -831,7 +905,7 @@ The user's latest answer was brief. Generate a follow-up question to help them e
         
         # Calculate interaction count (user messages only, since each user message is an answer)
         messages = self.messages.get(session_id, [])
-        user_message_count = len([msg for msg in messages if msg.role == MessageRole.USER])
+        user_message_count = len(self.get_messages_by_role(session_id, MessageRole.USER))
         
         # Get last save count for this session
         last_save_count = self.last_save_counts.get(session_id, 0)
@@ -843,12 +917,36 @@ The user's latest answer was brief. Generate a follow-up question to help them e
                 success = await self.session_svc.save_session(session, messages)
                 if success:
                     self.last_save_counts[session_id] = user_message_count
+                    await self._flush_conversation_log(session_id)
                     logger.info(
                         "session_auto_saved",
                         session_id=session_id,
                         interaction_count=user_message_count
                     )
     
+    async def _flush_conversation_log(self, session_id: Optional[str] = None):
+        """
+        Write buffered markdown interactions for a session to disk.
+        
+        Called at checkpoints (session saves, investigation completion) so the
+        markdown log never trails the saved session.
+        
+        Args:
+            session_id: Session identifier (None flushes every session)
+        """
+        storage = getattr(self.rag, "storage", None) if self.rag else None
+        if storage is None:
+            return
+        
+        try:
+            await storage.flush(session_id)
+        except Exception as e:
+            logger.error(
+                "conversation_log_flush_error",
+                error=str(e),
+                session_id=session_id
+            )
+    
     async def manual_save_session(self, session_id: str) -> bool:
         """
         Manually save session.
@@ -881,8 +979,9 @@ The user's latest answer was brief. Generate a follow-up question to help them e
         
         if success:
             # Update last save count
-            user_message_count = len([msg for msg in messages if msg.role == MessageRole.USER])
+            user_message_count = len(self.get_messages_by_role(session_id, MessageRole.USER))
             self.last_save_counts[session_id] = user_message_count
+            await self._flush_conversation_log(session_id)
             
             logger.info(
                 "session_manually_saved",
@@ -918,9 +1017,13 @@ The user's latest answer was brief. Generate a follow-up question to help them e
         # Restore session and messages to in-memory storage
         self.sessions[session_id] = session
         self.messages[session_id] = messages
+        by_role: Dict[MessageRole, List[Message]] = {}
+        for msg in messages:
+            by_role.setdefault(msg.role, []).append(msg)
+        self._messages_by_role[session_id] = by_role
         
         # Set last save count
-        user_message_count = len([msg for msg in messages if msg.role == MessageRole.USER])
+        user_message_count = len(by_role.get(MessageRole.USER, []))
         self.last_save_counts[session_id] = user_message_count
         
         logger.info(
@@ -936,6 +1039,7 @@ The user's latest answer was brief. Generate a follow-up question to help them e
 
 # Singleton instance
 _conversation_service_instance: Optional[ConversationService] = None
+_conversation_service_lock = threading.Lock()
 
 
 # Dependency injection helper
@@ -944,12 +1048,35 @@ def get_conversation_service() -> ConversationService:
     Dependency injection helper for FastAPI routes.
     Returns a singleton instance to persist sessions in memory.
     
+    Returns:
+        ConversationService singleton instance
+    """
+    # Fast path: a single global read once the singleton exists
+    instance = _conversation_service_instance
+    if instance is not None:
+        return instance
+    
+    return _init_conversation_service()
+
+
+def _init_conversation_service() -> ConversationService:
+    """
+    Create the ConversationService singleton (slow path of get_conversation_service).
+    
+    FastAPI runs this sync dependency in its threadpool, so concurrent first
+    requests could otherwise each build a service (and lose each other's
+    sessions); double-checked locking keeps it to one.
+    
     Returns:
         ConversationService singleton instance
     """
     global _conversation_service_instance
     
-    if _conversation_service_instance is None:
+    with _conversation_service_lock:
+        # Re-check under the lock: another request may have finished first
+        if _conversation_service_instance is not None:
+            return _conversation_service_instance
+        
         from services.llm_service import get_llm_service
         from services.rag_service import get_rag_service
         from services.question_generator import get_question_generator
@@ -973,5 +1100,11 @@ def get_conversation_service() -> ConversationService:
             session_service=session_service
         )
         logger.info("conversation_service_singleton_created")
-    
-    return _conversation_service_instance
+        
+        return _conversation_service_instance
+
+
+async def close_conversation_service() -> None:
+    """Flush buffered conversation logs of the singleton, if it was created."""
+    if _conversation_service_instance is not None:
+        await _conversation_service_instance._flush_conversation_log()
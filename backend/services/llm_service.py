@@ -16,6 +16,7 @@ SOLID Principles:
 
 import os
 from typing import Optional, AsyncGenerator
+import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 import structlog
 from langchain_groq import ChatGroq
@@ -75,7 +76,8 @@ class LLMService:
         model_id: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: int = 2000,
-        streaming: bool = False
+        streaming: bool = False,
+        http_async_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initialize the LLM provider with specified configuration.
@@ -89,6 +91,8 @@ class LLMService:
             temperature: Sampling temperature (0-1), defaults to 0.7
             max_tokens: Maximum tokens to generate, defaults to 2000
             streaming: Enable streaming responses, defaults to False
+            http_async_client: Optional shared httpx client for async requests;
+                by default the provider SDK creates its own
             
         Raises:
             ValueError: If provider or model_id is invalid
@@ -126,7 +130,8 @@ class LLMService:
             api_key=api_key,
             temperature=temperature,
             max_tokens=max_tokens,
-            streaming=streaming
+            streaming=streaming,
+            http_async_client=http_async_client
         )
         
         self.provider = provider
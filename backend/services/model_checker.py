@@ -419,7 +419,8 @@ class ModelChecker:
             provider: Provider name ('groq' or 'openai')
             model_id: Model identifier
             api_key: API key for authentication
-            **kwargs: Additional arguments to pass to the model (temperature, max_tokens, etc.)
+            **kwargs: Additional arguments to pass to the model (temperature, max_tokens,
+                streaming, timeout, http_async_client)
             
         Returns:
             LangChain chat model instance
@@ -437,7 +438,8 @@ class ModelChecker:
                 temperature=kwargs.get("temperature", 0.7),
                 max_tokens=kwargs.get("max_tokens", 2000),
                 streaming=kwargs.get("streaming", False),
-                request_timeout=kwargs.get("timeout", 60.0)
+                request_timeout=kwargs.get("timeout", 60.0),
+                http_async_client=kwargs.get("http_async_client")
             )
         elif provider == "openai":
             # Set env variable for OpenAI
@@ -447,7 +449,8 @@ class ModelChecker:
                 temperature=kwargs.get("temperature", 0.7),
                 max_tokens=kwargs.get("max_tokens", 2000),
                 streaming=kwargs.get("streaming", False),
-                request_timeout=kwargs.get("timeout", 60.0)
+                request_timeout=kwargs.get("timeout", 60.0),
+                http_async_client=kwargs.get("http_async_client")
             )
         else:
             raise ValueError(f"Unsupported provider: {provider}")
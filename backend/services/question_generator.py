@@ -5,10 +5,20 @@ Generates intelligent, context-aware questions for product investigation.
 Uses category-based templates and LLM for dynamic follow-ups.
 """
 
+import asyncio
+import hashlib
+import os
+import re
+import string
 import structlog
+import threading
+import time
 import uuid
-from typing import List, Optional
-from datetime import datetime
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from types import MappingProxyType
+from typing import Deque, Dict, List, Optional
+from datetime import datetime, timezone
 
 from models.conversation import Session, Question, ConversationState
 from services.llm_service import LLMService
@@ -16,76 +26,279 @@ from services.llm_service import LLMService
 logger = structlog.get_logger()
 
 
+# Static prompt scaffolding for follow-up questions (built once at import)
+_FOLLOWUP_SYSTEM_PROMPT = """You are an expert product investigator conducting a discovery interview.
+Your goal is to deeply understand the user's product idea through thoughtful questions.
+
+Generate a concise follow-up question that:
+1. Digs deeper into their latest answer
+2. Helps clarify vague or incomplete information
+3. Reveals important details about their product
+4. Is specific and actionable
+5. Is friendly and conversational (e.g., "Could you elaborate on...", "That's interesting, how would...")
+
+CRITICAL INSTRUCTIONS:
+- Integrate your reasoning naturally into the question (e.g., "Since you mentioned X, I'm curious about Y...").
+- Do NOT use headers like "Reasoning:" or "Question:".
+- Keep the entire response conversational and under 60 words.
+"""
+
+_FOLLOWUP_USER_TEMPLATE = """Current investigation category: {category}
+
+Recent conversation:
+{history}
+
+User's latest answer (needs clarification): {answer}
+{context}
+Generate a follow-up question to better understand their product."""
+
+
+# Category question system prompt. The prefix is byte-identical on every call
+# so providers with automatic prompt caching (OpenAI, Groq) can reuse it; all
+# category-specific text lives in the tail.
+_CATEGORY_SYSTEM_PREFIX = """You are an expert product investigator conducting a discovery interview.
+Your goal is to systematically gather information about a product idea across different dimensions (Functionality, Users, Design, etc.).
+
+CRITICAL INSTRUCTIONS:
+- Integrate your reasoning naturally into the question (e.g., "Given that this is a collaboration product, we should consider...").
+- Do NOT use headers like "Reasoning:" or "Question:".
+- Keep the entire response conversational and under 80 words.
+
+Generate a specific, engaging question to start exploring the topic given under "Current Focus" below.
+The question should:
+1. Be relevant to the user's previous answers (if any)
+2. Focus on that topic as it applies to their product
+3. Be conversational and professional (use a brief bridge if appropriate, e.g., "That's a great insight about...")
+4. Not repeat questions already asked
+5. Be open-ended to encourage detailed responses
+"""
+
+_CATEGORY_SYSTEM_TAIL = string.Template("""
+Current Focus: $category
+
+Example topics for $category:
+$examples
+""")
+
+_CATEGORY_USER_TEMPLATE = """Context of conversation so far:
+{history}
+{context}
+We are moving to a new topic: {category}.
+Generate a question to introduce this topic and gather key information. Acknowledge the previous context if relevant."""
+
+
+# Template follow-up per category (fallback when the LLM fails)
+_FOLLOWUP_FIRST = MappingProxyType({
+    ConversationState.START: "Could you tell me a bit about the product idea you have in mind?",
+    ConversationState.FUNCTIONALITY: "Can you give me a specific example of how that would work?",
+    ConversationState.USERS: "Can you describe a typical user's background or expertise?",
+    ConversationState.DEMOGRAPHICS: "Are there specific characteristics that define your target audience?",
+    ConversationState.DESIGN: "What emotion should users feel when using your product?",
+    ConversationState.MARKET: "What makes your approach different from existing solutions?",
+    ConversationState.TECHNICAL: "What technical capabilities are critical for your product?"
+})
+
+_DEFAULT_FOLLOWUP = "Could you tell me more about that?"
+
+# Category-based question templates (fallback and prompt examples)
+_CATEGORY_TEMPLATES = MappingProxyType({
+    ConversationState.START: (
+        "I'm excited to hear about your idea! To get us started, could you tell me what core problem your product solves?",
+    ),
+    ConversationState.FUNCTIONALITY: (
+        "That sounds interesting. Let's dive into the details—what are the main features users will interact with?",
+        "I'd love to understand the user experience better. How will users accomplish their primary goals with your product?",
+        "What would you say makes your product's functionality unique or innovative compared to what's out there?"
+    ),
+    ConversationState.USERS: (
+        "Let's talk about the people who will use this. Who do you see as your primary users?",
+        "Understanding your audience is key. What expertise level do your users have (beginner, intermediate, expert)?",
+        "What are the key characteristics or behaviors of your target users?"
+    ),
+    ConversationState.DEMOGRAPHICS: (
+        "Thinking about demographics, what is the age range of your target audience?",
+        "Are there specific geographic regions you are primarily targeting?",
+        "Are there any specific demographic factors that are important for your product's success?"
+    ),
+    ConversationState.DESIGN: (
+        "Now, let's visualize the product. Do you have specific design preferences (like modern, minimal, bold, or playful)?",
+        "Visually, are there any brand colors or style guidelines you'd like to follow?",
+        "What kind of mood or feeling should the design convey to your users?"
+    ),
+    ConversationState.MARKET: (
+        "Moving on to the market landscape—who are your main competitors?",
+        "In a crowded market, what is your unique value proposition compared to the alternatives?",
+        "Is there a specific market segment or niche you are targeting?"
+    ),
+    ConversationState.TECHNICAL: (
+        "On the technical side, do you have any specific stack preferences or requirements?",
+        "What are your expectations regarding scalability (e.g., number of users, data volume)?",
+        "Are there any specific integrations or APIs you know you'll need to support?"
+    ),
+    ConversationState.REVIEW: (
+        "We've covered a lot of ground! Let me summarize what we've discussed. Does this capture your vision accurately?",
+        "Before we finish, is there anything important about your product that we haven't covered yet?",
+        "Would you like to clarify or expand on any aspect of our conversation?"
+    )
+})
+
+# Full category system prompt per state (prefix + state-specific tail)
+_CATEGORY_SYSTEM_PROMPTS = MappingProxyType({
+    state: _CATEGORY_SYSTEM_PREFIX + _CATEGORY_SYSTEM_TAIL.substitute(
+        category=state.value,
+        examples="\n".join(f"- {t}" for t in templates[:3])
+    )
+    for state, templates in _CATEGORY_TEMPLATES.items()
+})
+
+# State progression order
+_STATE_ORDER = (
+    ConversationState.START,
+    ConversationState.FUNCTIONALITY,
+    ConversationState.USERS,
+    ConversationState.DEMOGRAPHICS,
+    ConversationState.DESIGN,
+    ConversationState.MARKET,
+    ConversationState.TECHNICAL,
+    ConversationState.REVIEW,
+    ConversationState.COMPLETE
+)
+
+# Precomputed transitions: each state maps to the one after it; the last
+# state (COMPLETE) maps to itself
+_NEXT_STATE = MappingProxyType({
+    state: _STATE_ORDER[i + 1] if i + 1 < len(_STATE_ORDER) else ConversationState.COMPLETE
+    for i, state in enumerate(_STATE_ORDER)
+})
+
+def _new_id() -> str:
+    """
+    Generate a time-ordered UUIDv7 string for a new Question.
+    
+    Uses the current Unix time in milliseconds plus 74 random bits from
+    os.urandom, read per call: no shared pool, so IDs stay unique across
+    threads and forked workers.
+    
+    Returns:
+        Canonical 36-character UUID string
+    """
+    rand = int.from_bytes(os.urandom(10), "big")
+    
+    unix_ms = time.time_ns() // 1_000_000
+    value = (
+        (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                               # version 7
+        | ((rand >> 62) & 0xFFF) << 64            # rand_a
+        | 0b10 << 62                              # RFC 4122 variant
+        | (rand & 0x3FFF_FFFF_FFFF_FFFF)          # rand_b
+    )
+    return str(uuid.UUID(int=value))
+
+
+def _count_words(text: str) -> int:
+    """Count whitespace-separated words (any run of spaces, tabs or newlines)."""
+    return len(text.split())
+
+
+def _utcnow() -> datetime:
+    """
+    Naive UTC now, like the timestamps on every other model in the app.
+    
+    Equivalent to the deprecated datetime.utcnow(); keeping it naive lets
+    Question timestamps be compared and stored alongside Message/Session ones.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Per-message cap for history lines sent to the LLM (bounds prompt tokens)
+_HISTORY_MESSAGE_MAX_CHARS = 300
+
+# Phrases that mark an answer as vague, matched in a single regex scan
+_VAGUE_INDICATORS = (
+    "i don't know",
+    "not sure",
+    "maybe",
+    "possibly",
+    "whatever",
+    "anything",
+    "doesn't matter"
+)
+_VAGUE_RE = re.compile("|".join(map(re.escape, _VAGUE_INDICATORS)), re.IGNORECASE)
+
+# Maximum number of LLM-generated category questions kept for reuse
+_QUESTION_CACHE_SIZE = 512
+
+# Streaming: stop at the first "?" after this many words. Default limits
+# (overridable per QuestionGenerator): give up on the stream after its
+# timeout, and on the question as a whole (stream plus any full-response
+# fallback) after the deadline. Both sit well above the LLM's own 60s
+# request timeout, so they only catch streams that stall outright.
+_STREAM_MIN_WORDS = 15
+_STREAM_TIMEOUT_SECONDS = 90.0
+_QUESTION_DEADLINE_SECONDS = 180.0
+
+# Number of preformatted history lines kept per session (largest prompt window)
+_HISTORY_WINDOW = 8
+
+# Maximum sessions with a history buffer; the least recently used is dropped
+# (and rebuilt from its message list if the session comes back)
+_HISTORY_CACHE_SESSIONS = 1024
+
+
+def _history_line(role, content: str) -> str:
+    """Format one message as a capped Q/A prompt line."""
+    # MessageRole is a str enum, so plain string comparison covers both forms
+    prefix = "Q" if role == "assistant" else "A"
+    return f"{prefix}: {content[:_HISTORY_MESSAGE_MAX_CHARS]}"
+
+
 class QuestionGenerator:
     """Service to generate context-aware questions for product investigation."""
     
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        stream_timeout: Optional[float] = _STREAM_TIMEOUT_SECONDS,
+        question_deadline: Optional[float] = _QUESTION_DEADLINE_SECONDS
+    ):
         """
         Initialize Question Generator.
         
         Args:
             llm_service: LLM service for dynamic question generation
+            stream_timeout: Seconds to wait for a streamed question before
+                falling back to a full response (None waits indefinitely)
+            question_deadline: Seconds allowed for a question including the
+                fallback (None waits indefinitely)
         """
         self.llm = llm_service
+        self.stream_timeout = stream_timeout
+        self.question_deadline = question_deadline
         
-        # Category-based question templates (Fallback)
-        self.category_templates = {
-            ConversationState.START: [
-                "I'm excited to hear about your idea! To get us started, could you tell me what core problem your product solves?"
-            ],
-            ConversationState.FUNCTIONALITY: [
-                "That sounds interesting. Let's dive into the details—what are the main features users will interact with?",
-                "I'd love to understand the user experience better. How will users accomplish their primary goals with your product?",
-                "What would you say makes your product's functionality unique or innovative compared to what's out there?"
-            ],
-            ConversationState.USERS: [
-                "Let's talk about the people who will use this. Who do you see as your primary users?",
-                "Understanding your audience is key. What expertise level do your users have (beginner, intermediate, expert)?",
-                "What are the key characteristics or behaviors of your target users?"
-            ],
-            ConversationState.DEMOGRAPHICS: [
-                "Thinking about demographics, what is the age range of your target audience?",
-                "Are there specific geographic regions you are primarily targeting?",
-                "Are there any specific demographic factors that are important for your product's success?"
-            ],
-            ConversationState.DESIGN: [
-                "Now, let's visualize the product. Do you have specific design preferences (like modern, minimal, bold, or playful)?",
-                "Visually, are there any brand colors or style guidelines you'd like to follow?",
-                "What kind of mood or feeling should the design convey to your users?"
-            ],
-            ConversationState.MARKET: [
-                "Moving on to the market landscape—who are your main competitors?",
-                "In a crowded market, what is your unique value proposition compared to the alternatives?",
-                "Is there a specific market segment or niche you are targeting?"
-            ],
-            ConversationState.TECHNICAL: [
-                "On the technical side, do you have any specific stack preferences or requirements?",
-                "What are your expectations regarding scalability (e.g., number of users, data volume)?",
-                "Are there any specific integrations or APIs you know you'll need to support?"
-            ],
-            ConversationState.REVIEW: [
-                "We've covered a lot of ground! Let me summarize what we've discussed. Does this capture your vision accurately?",
-                "Before we finish, is there anything important about your product that we haven't covered yet?",
-                "Would you like to clarify or expand on any aspect of our conversation?"
-            ]
-        }
-        
-        # State progression order
-        self.state_order = [
-            ConversationState.START,
-            ConversationState.FUNCTIONALITY,
-            ConversationState.USERS,
-            ConversationState.DEMOGRAPHICS,
-            ConversationState.DESIGN,
-            ConversationState.MARKET,
-            ConversationState.TECHNICAL,
-            ConversationState.REVIEW,
-            ConversationState.COMPLETE
-        ]
+        # Shared read-only templates and state order (see module constants)
+        self.category_templates = _CATEGORY_TEMPLATES
+        self.state_order = _STATE_ORDER
         
         # Minimum answer length for acceptable responses (in words)
         self.min_answer_words = 10
         
+        # Coverage constants (START/COMPLETE are not investigation categories)
+        self._excluded_states = frozenset({ConversationState.START, ConversationState.COMPLETE})
+        self._total_categories: int = sum(
+            1 for s in self.state_order if s not in self._excluded_states
+        )
+        
+        # Incrementally maintained prompt history, keyed by session id.
+        # _history_counts tracks how many messages each buffer has seen so a
+        # buffer that drifted from the caller's message list can be rebuilt.
+        self._history_cache: OrderedDict[str, Deque[str]] = OrderedDict()
+        self._history_counts: Dict[str, int] = {}
+        
+        # LRU cache of category question text keyed by a digest of the prompt
+        self._question_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         logger.info(
             "QuestionGenerator initialized",
             categories=len(self.category_templates),
@@ -122,14 +335,15 @@ class QuestionGenerator:
             return None
         
         # Determine if we need a follow-up question
-        needs_followup = self._needs_followup(latest_answer, session.state)
+        word_count = _count_words(latest_answer)
+        needs_followup = self._needs_followup(latest_answer, session.state, word_count)
         
         if needs_followup:
-            logger.info(
+            logger.debug(
                 "Generating follow-up question",
                 session_id=session.id,
                 state=session.state.value,
-                answer_length=len(latest_answer.split())
+                answer_length=word_count
             )
             return await self._generate_followup(
                 session,
@@ -138,7 +352,7 @@ class QuestionGenerator:
                 messages=messages
             )
         else:
-            logger.info(
+            logger.debug(
                 "Generating category question",
                 session_id=session.id,
                 next_state=next_state.value
@@ -163,26 +377,28 @@ class QuestionGenerator:
         Returns:
             Next conversation state
         """
-        try:
-            current_idx = self.state_order.index(current_state)
-            if current_idx + 1 < len(self.state_order):
-                return self.state_order[current_idx + 1]
-        except ValueError:
+        next_state = _NEXT_STATE.get(current_state)
+        if next_state is None:
             logger.warning(
                 "Unknown state, moving to START",
                 state=current_state.value
             )
             return ConversationState.START
-        
-        return ConversationState.COMPLETE
+        return next_state
     
-    def _needs_followup(self, answer: str, current_state: ConversationState) -> bool:
+    def _needs_followup(
+        self,
+        answer: str,
+        current_state: ConversationState,
+        word_count: Optional[int] = None
+    ) -> bool:
         """
         Determine if the answer needs a follow-up question.
         
         Args:
             answer: User's answer
             current_state: Current conversation state
+            word_count: Precomputed word count of the answer (optional)
             
         Returns:
             True if follow-up is needed, False otherwise
@@ -192,28 +408,193 @@ class QuestionGenerator:
             return False
         
         # Check answer length
-        word_count = len(answer.split())
+        if word_count is None:
+            word_count = _count_words(answer)
         
         # Very short answers likely need clarification
         if word_count < self.min_answer_words:
             return True
         
         # Check for vague responses
-        vague_indicators = [
-            "i don't know",
-            "not sure",
-            "maybe",
-            "possibly",
-            "whatever",
-            "anything",
-            "doesn't matter"
-        ]
-        
-        answer_lower = answer.lower()
-        if any(indicator in answer_lower for indicator in vague_indicators):
-            return True
+        return _VAGUE_RE.search(answer) is not None
+    
+    def record_message(self, session_id: str, role, content: str) -> None:
+        """
+        Append a message to the session's prompt history buffer.
+        
+        Called by the owner of the message list whenever a message is added,
+        so prompt history is formatted once per message instead of per turn.
+        
+        Args:
+            session_id: Session identifier
+            role: Message role (MessageRole or plain string)
+            content: Message content
+        """
+        buffer = self._history_cache.get(session_id)
+        if buffer is None:
+            buffer = self._store_history(session_id, deque(maxlen=_HISTORY_WINDOW), 0)
+        else:
+            self._history_cache.move_to_end(session_id)
+        buffer.append(_history_line(role, content))
+        self._history_counts[session_id] += 1
+    
+    def _store_history(self, session_id: str, buffer: Deque[str], count: int) -> Deque[str]:
+        """Install a session's history buffer, evicting the least recently used one."""
+        self._history_cache[session_id] = buffer
+        self._history_cache.move_to_end(session_id)
+        self._history_counts[session_id] = count
+        if len(self._history_cache) > _HISTORY_CACHE_SESSIONS:
+            evicted, _ = self._history_cache.popitem(last=False)
+            self._history_counts.pop(evicted, None)
+        return buffer
+    
+    def forget_history(self, session_id: str) -> None:
+        """
+        Drop the session's prompt history buffer (e.g. after an answer edit
+        or when the session is deleted).
+        
+        The buffer is rebuilt from the message list on the next prompt.
+        
+        Args:
+            session_id: Session identifier
+        """
+        self._history_cache.pop(session_id, None)
+        self._history_counts.pop(session_id, None)
+    
+    def _format_history(
+        self,
+        messages: Optional[List],
+        limit: int,
+        session_id: Optional[str] = None
+    ) -> str:
+        """
+        Format the tail of the conversation as Q/A lines for LLM prompts.
+        
+        Only the last `limit` messages are included and each message is capped
+        at _HISTORY_MESSAGE_MAX_CHARS so prompt size stays bounded on long
+        sessions. When the session's history buffer is in sync with `messages`
+        the preformatted lines are reused; otherwise the buffer is rebuilt.
+        
+        Args:
+            messages: Optional list of Message objects from conversation history
+            limit: Maximum number of recent messages to include
+            session_id: Optional session id owning the history buffer
+            
+        Returns:
+            Newline-joined history string (empty if no messages)
+        """
+        if not messages:
+            return ""
+        
+        if session_id is None:
+            return "\n".join([
+                _history_line(msg.role, msg.content) for msg in messages[-limit:]
+            ])
         
-        return False
+        buffer = self._history_cache.get(session_id)
+        if buffer is None or self._history_counts[session_id] != len(messages):
+            buffer = self._store_history(
+                session_id,
+                deque(
+                    (_history_line(msg.role, msg.content)
+                     for msg in messages[-_HISTORY_WINDOW:]),
+                    maxlen=_HISTORY_WINDOW
+                ),
+                len(messages)
+            )
+        else:
+            self._history_cache.move_to_end(session_id)
+        
+        return "\n".join(islice(buffer, max(len(buffer) - limit, 0), None))
+    
+    async def _stream_question_text(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        parts: List[str]
+    ) -> str:
+        """
+        Stream a question from the LLM, stopping at the first question mark.
+        
+        Generation is cut off once a "?" arrives after more than
+        _STREAM_MIN_WORDS words, so the caller does not wait for (or pay for)
+        trailing text after the question itself.
+        
+        Args:
+            system_prompt: System prompt for the LLM
+            user_prompt: User prompt for the LLM
+            parts: Caller-owned list the received deltas are appended to, so
+                partial text survives a timeout
+            
+        Returns:
+            Streamed text, truncated after the question mark when cut short
+        """
+        stream = self.llm.stream_response(system_prompt, user_prompt, temperature=0.7)
+        try:
+            async for delta in stream:
+                parts.append(delta)
+                if "?" in delta:
+                    text = "".join(parts)
+                    end = text.rfind("?") + 1
+                    if _count_words(text[:end]) > _STREAM_MIN_WORDS:
+                        return text[:end]
+            return "".join(parts)
+        finally:
+            # Closes the HTTP stream when cut short, failed or timed out
+            await stream.aclose()
+    
+    async def _complete_question(self, system_prompt: str, user_prompt: str) -> str:
+        """
+        Get question text from the LLM, streaming with a full-response fallback.
+        
+        When streaming fails or times out after a complete question has
+        already arrived, that partial text is used as is. Otherwise falls back
+        to generate_response, bounded by what is left of question_deadline
+        so a stalled stream cannot add a full retry cycle on top of its own
+        timeout.
+        
+        Args:
+            system_prompt: System prompt for the LLM
+            user_prompt: User prompt for the LLM
+            
+        Returns:
+            Raw question text from the LLM
+            
+        Raises:
+            TimeoutError: If the fallback does not finish before the deadline
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        parts: List[str] = []
+        try:
+            text = await asyncio.wait_for(
+                self._stream_question_text(system_prompt, user_prompt, parts),
+                timeout=self.stream_timeout
+            )
+            if text.strip():
+                return text
+        except Exception as e:
+            partial = "".join(parts)
+            end = partial.rfind("?") + 1
+            if partial[:end].strip():
+                logger.warning(
+                    "question_stream_failed_using_partial_text",
+                    error_type=type(e).__name__
+                )
+                return partial[:end]
+            logger.warning(
+                "question_stream_failed_using_full_response",
+                error=str(e),
+                error_type=type(e).__name__
+            )
+        
+        remaining = None
+        if self.question_deadline is not None:
+            remaining = max(started + self.question_deadline - loop.time(), 0)
+        return await asyncio.wait_for(
+            self.llm.generate_response(system_prompt, user_prompt, temperature=0.7),
+            timeout=remaining
+        )
     
     async def _generate_followup(
         self,
@@ -234,52 +615,26 @@ class QuestionGenerator:
         Returns:
             Follow-up Question object
         """
-        system_prompt = """You are an expert product investigator conducting a discovery interview.
-Your goal is to deeply understand the user's product idea through thoughtful questions.
-
-Generate a concise follow-up question that:
-1. Digs deeper into their latest answer
-2. Helps clarify vague or incomplete information
-3. Reveals important details about their product
-4. Is specific and actionable
-5. Is friendly and conversational (e.g., "Could you elaborate on...", "That's interesting, how would...")
-
-CRITICAL INSTRUCTIONS:
-- Integrate your reasoning naturally into the question (e.g., "Since you mentioned X, I'm curious about Y...").
-- Do NOT use headers like "Reasoning:" or "Question:".
-- Keep the entire response conversational and under 60 words.
-"""
-        
-        # Build context string
-        context_str = "\n\n".join(context[-3:]) if context else ""
-        
         # Get conversation history (last 4 exchanges)
-        history_str = ""
-        if messages:
-            recent_messages = messages[-8:] if len(messages) >= 8 else messages
-            history_str = "\n".join([
-                f"{'Q' if (hasattr(msg.role, 'value') and msg.role.value == 'assistant') or msg.role == 'assistant' else 'A'}: {msg.content}"
-                for msg in recent_messages
-            ])
+        history_str = self._format_history(messages, limit=8, session_id=session.id)
         
         context_section = ""
-        if context_str:
-            context_section = f"\nPrevious context:\n{context_str}\n"
-        
-        user_prompt = f"""Current investigation category: {session.state.value}
+        if context:
+            context_section = "\nPrevious context:\n" + "\n\n".join(
+                islice(context, max(len(context) - 3, 0), None)
+            ) + "\n"
         
-Recent conversation:
-{history_str}
-
-User's latest answer (needs clarification): {latest_answer}
-{context_section}
-Generate a follow-up question to better understand their product."""
+        user_prompt = _FOLLOWUP_USER_TEMPLATE.format(
+            category=session.state.value,
+            history=history_str,
+            answer=latest_answer,
+            context=context_section
+        )
         
         try:
-            question_text = await self.llm.generate_response(
-                system_prompt,
-                user_prompt,
-                temperature=0.7
+            question_text = await self._complete_question(
+                _FOLLOWUP_SYSTEM_PROMPT,
+                user_prompt
             )
             
             # Clean up the response
@@ -299,11 +654,11 @@ Generate a follow-up question to better understand their product."""
             question_text = self._get_template_followup(session.state, latest_answer)
         
         return Question(
-            id=str(uuid.uuid4()),
+            id=_new_id(),
             text=question_text,
             category=session.state.value,
             is_followup=True,
-            timestamp=datetime.utcnow()
+            timestamp=_utcnow()
         )
     
     async def _generate_category_question(
@@ -326,7 +681,7 @@ Generate a follow-up question to better understand their product."""
             Category Question object, or None if no templates available
         """
         # Get templates as fallback/guide
-        templates = self.category_templates.get(state, [])
+        templates = self.category_templates.get(state, ())
         
         if not templates:
             logger.warning(
@@ -338,91 +693,77 @@ Generate a follow-up question to better understand their product."""
         # If we don't have messages history yet, use the first template to start fast
         if not messages and state == ConversationState.START:
              return Question(
-                id=str(uuid.uuid4()),
+                id=_new_id(),
                 text=templates[0],
                 category=state.value,
                 is_followup=False,
-                timestamp=datetime.utcnow()
+                timestamp=_utcnow()
             )
 
         # Build context from previous answers to make the question relevant
-        history_summary = ""
-        if messages:
-            # Get last few exchanges to maintain flow
-            recent_messages = messages[-6:] if len(messages) >= 6 else messages
-            history_summary = "\n".join([
-                f"{'Q' if (hasattr(msg.role, 'value') and msg.role.value == 'assistant') or msg.role == 'assistant' else 'A'}: {msg.content}"
-                for msg in recent_messages
-            ])
-
-        system_prompt = """You are an expert product investigator conducting a discovery interview.
-Your goal is to systematically gather information about a product idea across different dimensions (Functionality, Users, Design, etc.).
-
-Current Focus: {category}
-
-Generate a specific, engaging question to start exploring this topic.
-The question should:
-1. Be relevant to the user's previous answers (if any)
-2. Focus on the '{category}' aspect of their product
-3. Be conversational and professional (use a brief bridge if appropriate, e.g., "That's a great insight about...")
-4. Not repeat questions already asked
-5. Be open-ended to encourage detailed responses
+        # Get last few exchanges to maintain flow
+        history_summary = self._format_history(messages, limit=6, session_id=session.id)
 
-Example topics for {category}:
-{examples}
-
-5. Be open-ended to encourage detailed responses
-
-Example topics for {category}:
-{examples}
-
-CRITICAL INSTRUCTIONS:
-- Integrate your reasoning naturally into the question (e.g., "Given that this is a {category} product, we should consider...").
-- Do NOT use headers like "Reasoning:" or "Question:".
-- Keep the entire response conversational and under 80 words.
-"""
-
-        # Format examples from templates
-        examples_text = "\n".join([f"- {t}" for t in templates[:3]])
-        
         # Format RAG context
         context_section = ""
         if context:
-            context_str = "\n".join(context[:3])
-            context_section = f"\nRelevant Context from previous topics:\n{context_str}\n"
-        
-        user_prompt = f"""Context of conversation so far:
-{history_summary}
-{context_section}
-We are moving to a new topic: {state.value}.
-Generate a question to introduce this topic and gather key information. Acknowledge the previous context if relevant."""
+            context_section = "\nRelevant Context from previous topics:\n" + "\n".join(
+                islice(context, 3)
+            ) + "\n"
+        
+        user_prompt = _CATEGORY_USER_TEMPLATE.format_map({
+            "history": history_summary,
+            "context": context_section,
+            "category": state.value
+        })
+
+        # The system prompt is fixed per state and the user prompt names the
+        # state, so the user prompt alone identifies the LLM request
+        cache_key = hashlib.blake2b(user_prompt.encode(), digest_size=16).digest()
+        cached_text = self._question_cache.get(cache_key)
+        if cached_text is not None:
+            self._question_cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            logger.debug(
+                "category_question_cache_hit",
+                category=state.value,
+                hits=self.cache_hits
+            )
+            return Question(
+                id=_new_id(),
+                text=cached_text,
+                category=state.value,
+                is_followup=False,
+                timestamp=_utcnow()
+            )
+        self.cache_misses += 1
 
         try:
             # Generate question using LLM
-            question_text = await self.llm.generate_response(
-                system_prompt=system_prompt.format(
-                    category=state.value,
-                    examples=examples_text
-                ),
-                user_message=user_prompt,
-                temperature=0.7
+            question_text = await self._complete_question(
+                _CATEGORY_SYSTEM_PROMPTS[state],
+                user_prompt
             )
             
             # Clean up response
             question_text = question_text.strip().strip('"').strip("'")
             
-            logger.info(
+            logger.debug(
                 "generated_dynamic_category_question",
                 category=state.value,
                 question_length=len(question_text)
             )
+            
+            self._question_cache[cache_key] = question_text
+            if len(self._question_cache) > _QUESTION_CACHE_SIZE:
+                self._question_cache.popitem(last=False)
 
             return Question(
-                id=str(uuid.uuid4()),
+                id=_new_id(),
                 text=question_text,
                 category=state.value,
                 is_followup=False,
-                timestamp=datetime.utcnow()
+                timestamp=_utcnow()
             )
         except Exception as e:
             logger.error(
@@ -434,11 +775,11 @@ Generate a question to introduce this topic and gather key information. Acknowle
             )
             # EXPLICIT ERROR REPORTING FOR TESTING
             return Question(
-                id=str(uuid.uuid4()),
+                id=_new_id(),
                 text=f"[SYSTEM ERROR] Category Question Generation Failed: {str(e)}",
                 category=state.value,
                 is_followup=False,
-                timestamp=datetime.utcnow()
+                timestamp=_utcnow()
             )
     
     def _get_template_followup(self, state: ConversationState, answer: str) -> str:
@@ -452,52 +793,7 @@ Generate a question to introduce this topic and gather key information. Acknowle
         Returns:
             Follow-up question text
         """
-        # Generic follow-up templates by category
-        followup_templates = {
-            ConversationState.START: [
-                "Could you tell me a bit about the product idea you have in mind?",
-                "To help you best, I need to understand the main problem your product solves. What is it?",
-                "Please describe the core concept of your product."
-            ],
-            ConversationState.FUNCTIONALITY: [
-                "Can you give me a specific example of how that would work?",
-                "What would be the most important aspect of that feature?",
-                "How do you envision users interacting with that?"
-            ],
-            ConversationState.USERS: [
-                "Can you describe a typical user's background or expertise?",
-                "What would motivate someone to use your product?",
-                "What problems do these users currently face?"
-            ],
-            ConversationState.DEMOGRAPHICS: [
-                "Are there specific characteristics that define your target audience?",
-                "Which demographic factors are most relevant to your product?",
-                "How would you reach this audience?"
-            ],
-            ConversationState.DESIGN: [
-                "What emotion should users feel when using your product?",
-                "Are there any design examples you admire?",
-                "What should be the visual focus of the interface?"
-            ],
-            ConversationState.MARKET: [
-                "What makes your approach different from existing solutions?",
-                "Who would be your ideal first customers?",
-                "What's the key benefit users would pay for?"
-            ],
-            ConversationState.TECHNICAL: [
-                "What technical capabilities are critical for your product?",
-                "Do you have any performance or security requirements?",
-                "What platforms or devices need to be supported?"
-            ]
-        }
-        
-        templates = followup_templates.get(
-            state,
-            ["Could you tell me more about that?", "Can you elaborate on that point?"]
-        )
-        
-        # Return first template (simple fallback)
-        return templates[0]
+        return _FOLLOWUP_FIRST.get(state, _DEFAULT_FOLLOWUP)
     
     def get_initial_question(self) -> Question:
         """
@@ -509,11 +805,11 @@ Generate a question to introduce this topic and gather key information. Acknowle
         question_text = self.category_templates[ConversationState.START][0]
         
         return Question(
-            id=str(uuid.uuid4()),
+            id=_new_id(),
             text=question_text,
             category=ConversationState.START.value,
             is_followup=False,
-            timestamp=datetime.utcnow()
+            timestamp=_utcnow()
         )
     
     def get_category_coverage(self, session: Session, messages: Optional[List] = None) -> dict:
@@ -527,33 +823,25 @@ Generate a question to introduce this topic and gather key information. Acknowle
         Returns:
             Dictionary with coverage statistics
         """
-        covered_states = set()
-        question_count_by_category = {}
-        
-        if messages:
-            for msg in messages:
-                if msg.role == 'assistant':
-                    category = msg.metadata.get('category')
-                    if category:
-                        covered_states.add(category)
-                        question_count_by_category[category] = \
-                            question_count_by_category.get(category, 0) + 1
-        
-        total_categories = len([s for s in self.state_order 
-                               if s not in [ConversationState.START, 
-                                          ConversationState.COMPLETE]])
+        counts = Counter(
+            category
+            for msg in (messages or ())
+            if msg.role == 'assistant' and (category := msg.metadata.get('category'))
+        )
+        covered = len(counts)
         
         return {
-            'covered_categories': len(covered_states),
-            'total_categories': total_categories,
-            'coverage_percentage': (len(covered_states) / total_categories * 100) 
-                                  if total_categories > 0 else 0,
-            'questions_by_category': question_count_by_category
+            'covered_categories': covered,
+            'total_categories': self._total_categories,
+            'coverage_percentage': (covered / self._total_categories * 100) 
+                                  if self._total_categories > 0 else 0,
+            'questions_by_category': dict(counts)
         }
 
 
 # Singleton instance
 _question_generator_instance: Optional[QuestionGenerator] = None
+_question_generator_lock = threading.Lock()
 
 
 def get_question_generator(llm_service: Optional[LLMService] = None) -> QuestionGenerator:
@@ -563,15 +851,39 @@ def get_question_generator(llm_service: Optional[LLMService] = None) -> Question
     Args:
         llm_service: LLM service instance (required for first call)
         
+    Returns:
+        QuestionGenerator instance
+    """
+    # Fast path: a single global read once the singleton exists
+    instance = _question_generator_instance
+    if instance is not None:
+        return instance
+    
+    return _init_question_generator(llm_service)
+
+
+def _init_question_generator(llm_service: Optional[LLMService]) -> QuestionGenerator:
+    """
+    Create the Question Generator singleton (slow path of get_question_generator).
+    
+    Uses double-checked locking so concurrent first calls build one instance;
+    the fast path in get_question_generator never takes the lock.
+    
+    Args:
+        llm_service: LLM service instance
+        
     Returns:
         QuestionGenerator instance
     """
     global _question_generator_instance
     
-    if _question_generator_instance is None:
+    with _question_generator_lock:
+        # Re-check under the lock: another caller may have finished first
+        if _question_generator_instance is not None:
+            return _question_generator_instance
+        
         if llm_service is None:
             raise ValueError("llm_service required for first QuestionGenerator initialization")
         
         _question_generator_instance = QuestionGenerator(llm_service=llm_service)
-    
-    return _question_generator_instance
+        return _question_generator_instance
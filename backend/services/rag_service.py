@@ -5,13 +5,20 @@ Provides context-aware conversation using semantic search over historical intera
 Uses ChromaDB for persistent vector database and sentence-transformers for embeddings.
 """
 
+import asyncio
+import os
 import structlog
-from typing import List, Dict, Optional, Tuple
-from datetime import datetime
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Literal, Optional, Set, Tuple
+from datetime import datetime, timezone
 from pathlib import Path
-import hashlib
 
 import chromadb
+import numpy as np
+import torch
+import xxhash
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 
@@ -19,6 +26,319 @@ from storage.conversation_storage import ConversationStorage
 
 logger = structlog.get_logger()
 
+_COLLECTION_NAME = "conversations"
+
+# Embeddings are unit-normalized, so inner product equals cosine similarity
+# and ChromaDB can skip the per-query norm computation. HNSW graph
+# parameters can be re-tuned per deployment via CHROMA_HNSW_* env vars.
+# Applied only when the collection is created: an existing collection keeps
+# the parameters its index was built with.
+_COLLECTION_METADATA = {
+    "hnsw:space": "ip",
+    "hnsw:M": int(os.getenv("CHROMA_HNSW_M", "24")),
+    "hnsw:construction_ef": int(os.getenv("CHROMA_HNSW_CONSTRUCTION_EF", "128")),
+    "hnsw:search_ef": int(os.getenv("CHROMA_HNSW_SEARCH_EF", "100")),
+    "hnsw:num_threads": int(os.getenv("CHROMA_HNSW_NUM_THREADS", str(os.cpu_count() or 1)))
+}
+
+
+# Candidate over-fetch per recall mode: (multiple of top_k, cap). Scores are
+# re-ranked with recency after the search, so fetching more candidates
+# trades latency for recall of older-but-relevant chunks.
+_RECALL_MODES = {
+    "fast": (1, 20),
+    "balanced": (2, 50),
+    "high": (4, 100)
+}
+
+# Answers in over-long chunks are cut to their tail before embedding, since
+# the encoder would otherwise drop the end of the answer at max_seq_length.
+_EMBED_ANSWER_TAIL_CHARS = 400
+
+# Fields returned by retrieve_context's query. ChromaDB 0.4 requires a list
+# (and a plain dict for where filters), so these are shared, never mutated.
+_QUERY_INCLUDE = ["documents", "metadatas", "distances"]
+
+
+@lru_cache(maxsize=1024)
+def _session_where(session_id: str) -> Dict:
+    """Return the shared where filter selecting a session's chunks."""
+    return {"session_id": session_id}
+
+
+# Reduced-precision query/chunk encoding (fp16 on CUDA, int8 on CPU) is
+# opt-in: its vectors differ slightly from the fp32 ones already stored, so
+# enable it (EMBEDDING_REDUCED_PRECISION=1) only for a fresh collection.
+_REDUCED_PRECISION_DEFAULT = os.getenv("EMBEDDING_REDUCED_PRECISION", "").lower() in ("1", "true", "yes")
+
+
+def _encode(model: SentenceTransformer, texts, batch_size: int = 32) -> np.ndarray:
+    """Encode texts to unit-normalized embeddings without autograd tracking."""
+    with torch.inference_mode():
+        return model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+
+
+class BatchingEncoder:
+    """
+    Coalesce concurrent embedding requests into batched encode calls.
+    
+    The first request in a window starts a batch that waits up to `max_wait`
+    seconds for others to join (at most `max_batch` texts), then encodes the
+    whole batch with a single model.encode call off the event loop, so
+    concurrent sessions share one forward pass instead of paying for one each.
+    
+    Each batch runs in its own task, so a caller being cancelled (a client
+    disconnect, a wait_for timeout) only cancels its own wait; the rest of
+    the batch still gets its embeddings.
+    """
+    
+    def __init__(self, model: SentenceTransformer, max_batch: int = 32, max_wait: float = 0.025):
+        """
+        Initialize the batching encoder.
+        
+        Args:
+            model: SentenceTransformer used for encoding
+            max_batch: Maximum number of texts per encode call
+            max_wait: Seconds to wait for more requests after the first arrives
+        """
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        # Batch currently collecting requests: (items, full_event)
+        self._pending: Optional[Tuple[List, asyncio.Event]] = None
+        # Running batch tasks, referenced so they aren't garbage collected
+        self._batches: Set[asyncio.Task] = set()
+    
+    async def encode(self, text: str) -> np.ndarray:
+        """
+        Add a text to the open batch and wait for its embedding.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding as a float32 vector
+        """
+        future = asyncio.get_running_loop().create_future()
+        
+        if self._pending is not None:
+            items, full = self._pending
+            items.append((text, future))
+            if len(items) >= self.max_batch:
+                self._pending = None
+                full.set()
+        else:
+            # First request of the window opens a new batch
+            items, full = self._pending = ([(text, future)], asyncio.Event())
+            task = asyncio.create_task(self._run_batch(items, full))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+        
+        return await future
+    
+    async def _run_batch(self, items: List, full: asyncio.Event) -> None:
+        """
+        Collect a batch until it is full or `max_wait` passes, then encode it.
+        
+        Args:
+            items: (text, future) pairs; callers keep appending while it is open
+            full: Set once the batch reaches `max_batch` texts
+        """
+        try:
+            try:
+                await asyncio.wait_for(full.wait(), self.max_wait)
+            except asyncio.TimeoutError:
+                pass
+            if self._pending is not None and self._pending[0] is items:
+                self._pending = None
+            
+            embeddings = await asyncio.to_thread(
+                _encode, self.model, [t for t, _ in items], self.max_batch
+            )
+            for (_, f), embedding in zip(items, embeddings):
+                if not f.done():
+                    f.set_result(embedding.astype(np.float32, copy=False))
+        except BaseException as e:
+            if self._pending is not None and self._pending[0] is items:
+                self._pending = None
+            for _, f in items:
+                if f.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    f.cancel()
+                else:
+                    f.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+
+
+class QueryCache:
+    """
+    Similarity cache for retrieve_context results.
+    
+    Stores recent query embeddings with the chunks they returned, scoped by
+    session and retrieval parameters. A new query whose embedding is close
+    enough to a fresh cached one reuses its chunks and skips the ChromaDB
+    search. Entries for a session are dropped whenever its chunks change.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl_seconds: float = 300.0,
+        max_scopes: int = 64,
+        max_per_scope: int = 32
+    ):
+        """
+        Initialize the query cache.
+        
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: Maximum age of a reusable entry
+            max_scopes: Maximum number of (session, parameters) scopes kept (LRU)
+            max_per_scope: Maximum entries per scope (oldest evicted first)
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_scopes = max_scopes
+        self.max_per_scope = max_per_scope
+        self._scopes: "OrderedDict[Tuple, List[Tuple[np.ndarray, List[str], float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def lookup(self, scope: Tuple, embedding: np.ndarray) -> Optional[List[str]]:
+        """
+        Find cached chunks for a similar query in the same scope.
+        
+        Args:
+            scope: (session_id, *retrieval parameters) tuple
+            embedding: Unit-normalized query embedding
+            
+        Returns:
+            Copy of the cached chunks, or None on a miss
+        """
+        entries = self._scopes.get(scope)
+        if entries:
+            cutoff = time.monotonic() - self.ttl_seconds
+            entries[:] = [e for e in entries if e[2] >= cutoff]
+        if not entries:
+            self.misses += 1
+            return None
+        
+        sims = np.stack([e[0] for e in entries]) @ embedding
+        best = int(sims.argmax())
+        if sims[best] < self.threshold:
+            self.misses += 1
+            return None
+        
+        self._scopes.move_to_end(scope)
+        self.hits += 1
+        return list(entries[best][1])
+    
+    def store(self, scope: Tuple, embedding: np.ndarray, chunks: List[str]) -> None:
+        """
+        Cache the chunks returned for a query.
+        
+        Args:
+            scope: (session_id, *retrieval parameters) tuple
+            embedding: Unit-normalized query embedding
+            chunks: Chunks returned by retrieve_context
+        """
+        entries = self._scopes.setdefault(scope, [])
+        self._scopes.move_to_end(scope)
+        entries.append((embedding, list(chunks), time.monotonic()))
+        if len(entries) > self.max_per_scope:
+            del entries[0]
+        if len(self._scopes) > self.max_scopes:
+            self._scopes.popitem(last=False)
+    
+    def invalidate(self, session_id: Optional[str] = None) -> None:
+        """
+        Drop cached entries for a session (or all entries).
+        
+        Args:
+            session_id: Session whose entries to drop; None clears everything
+        """
+        if session_id is None:
+            self._scopes.clear()
+            return
+        for scope in [s for s in self._scopes if s[0] == session_id]:
+            del self._scopes[scope]
+
+
+class EmbeddingCache:
+    """
+    LRU cache of embeddings keyed by a hash of the embedded text.
+    
+    Repeated queries and re-persisted Q/A text reuse the stored vector
+    instead of running another forward pass. Cached arrays are read-only
+    because they are shared between callers.
+    """
+    
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300.0):
+        """
+        Initialize the embedding cache.
+        
+        Args:
+            max_entries: Maximum number of cached embeddings (LRU)
+            ttl_seconds: Maximum age of a reusable entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[np.ndarray, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return xxhash.xxh3_128_digest(text.encode("utf-8"))
+    
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Return the cached embedding for text, if fresh.
+        
+        Args:
+            text: Embedded text
+            
+        Returns:
+            Cached embedding, or None on a miss
+        """
+        key = self._key(text)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic() - self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+    
+    def put(self, text: str, embedding: np.ndarray) -> np.ndarray:
+        """
+        Cache the embedding for text.
+        
+        Args:
+            text: Embedded text
+            embedding: Embedding vector
+            
+        Returns:
+            The cached (read-only) embedding
+        """
+        embedding.flags.writeable = False
+        key = self._key(text)
+        self._entries[key] = (embedding, time.monotonic())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return embedding
+
 
 class RAGService:
     """RAG Service with ChromaDB persistent vector storage."""
@@ -27,7 +347,9 @@ class RAGService:
         self,
         storage: ConversationStorage,
         embedding_model: str = "all-MiniLM-L6-v2",
-        persist_directory: str = "./data/vectors"
+        persist_directory: str = "./data/vectors",
+        max_seq_length: int = 128,
+        reduced_precision: bool = _REDUCED_PRECISION_DEFAULT
     ):
         """
         Initialize RAG Service with ChromaDB.
@@ -36,43 +358,161 @@ class RAGService:
             storage: ConversationStorage instance for markdown persistence
             embedding_model: SentenceTransformer model name
             persist_directory: Directory for ChromaDB persistent storage
+            max_seq_length: Encoder token limit (the model default is 256)
+            reduced_precision: Encode with fp16 (CUDA) / int8 (CPU) weights;
+                only safe for collections embedded the same way
         """
         self.storage = storage
         self.embedding_model_name = embedding_model
+        self.reduced_precision = reduced_precision
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(parents=True, exist_ok=True)
         
         # Initialize embedding model
         logger.info(f"Loading embedding model: {embedding_model}")
-        self.embedding_model = SentenceTransformer(embedding_model)
+        self.embedding_model = self._load_embedding_model(embedding_model)
+        self.embedding_model.max_seq_length = max_seq_length
+        self.max_seq_length = max_seq_length
+        self.encoder = BatchingEncoder(self.embedding_model)
+        self.query_cache = QueryCache()
+        self.embedding_cache = EmbeddingCache()
         
         # Initialize ChromaDB client with persistent storage
         self.chroma_client = chromadb.PersistentClient(
             path=str(self.persist_directory)
         )
         
-        # Get or create collection
-        self.collection = self.chroma_client.get_or_create_collection(
-            name="conversations",
-            metadata={"hnsw:space": "cosine"}  # Use cosine similarity
-        )
+        self.collection = self._open_collection()
         
         logger.info(
             "RAG Service initialized",
             embedding_model=embedding_model,
-            persist_directory=str(self.persist_directory),
-            collection_count=self.collection.count()
+            persist_directory=str(self.persist_directory)
         )
     
-    def _embed_text(self, text: str) -> List[float]:
-        """Generate embedding for text."""
-        embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+    def _collection_metadata(self) -> Dict:
+        """Metadata for a new collection: index parameters plus the embedding used."""
+        return {
+            **_COLLECTION_METADATA,
+            "embedding_model": self.embedding_model_name,
+            "embedding_precision": "reduced" if self.reduced_precision else "full"
+        }
+    
+    def _open_collection(self):
+        """
+        Open the conversations collection, creating it if it doesn't exist.
+        
+        Metadata is only passed on creation; an existing collection keeps the
+        index parameters it was built with. Mismatches with the current
+        configuration are logged instead of overwritten.
+        
+        Returns:
+            ChromaDB collection
+        """
+        try:
+            collection = self.chroma_client.get_collection(name=_COLLECTION_NAME)
+        except ValueError:
+            return self.chroma_client.create_collection(
+                name=_COLLECTION_NAME,
+                metadata=self._collection_metadata()
+            )
+        
+        stored = collection.metadata or {}
+        expected = self._collection_metadata()
+        # Collections created before the embedding tags existed hold fp32
+        # vectors from the default model
+        stored = {
+            "hnsw:space": "l2",
+            "embedding_model": "all-MiniLM-L6-v2",
+            "embedding_precision": "full",
+            **stored
+        }
+        for key in ("hnsw:space", "embedding_model", "embedding_precision"):
+            if stored[key] != expected[key]:
+                logger.warning(
+                    "collection_metadata_mismatch",
+                    key=key,
+                    stored=stored[key],
+                    configured=expected[key]
+                )
+        return collection
+    
+    @property
+    def collection_count(self) -> int:
+        """Number of chunks in the collection (counted on access, not at init)."""
+        return self.collection.count()
+    
+    def _load_embedding_model(self, embedding_model: str) -> SentenceTransformer:
+        """
+        Load the embedding model for inference.
+        
+        Places the model on CUDA when available. With reduced_precision set,
+        the model runs in fp16 on CUDA, or with Linear layers dynamically
+        quantized to int8 on CPU (falling back to fp32 if unsupported).
+        
+        Args:
+            embedding_model: SentenceTransformer model name
+            
+        Returns:
+            Loaded SentenceTransformer model
+        """
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        model = SentenceTransformer(embedding_model, device=device)
+        model.eval()
+        
+        if not self.reduced_precision:
+            return model
+        
+        if device == "cuda":
+            return model.half()
+        
+        try:
+            return torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        except Exception as e:
+            logger.warning("embedding_quantization_unavailable", error=str(e))
+            return model
+    
+    def _embed_text(self, text: str) -> np.ndarray:
+        """Generate a unit-normalized float32 embedding for text."""
+        embedding = self.embedding_cache.get(text)
+        if embedding is None:
+            embedding = _encode(self.embedding_model, text)
+            embedding = self.embedding_cache.put(text, embedding.astype(np.float32, copy=False))
+        return embedding
+    
+    async def _embed_text_async(self, text: str) -> np.ndarray:
+        """Generate embedding for text, batched with concurrent requests."""
+        embedding = self.embedding_cache.get(text)
+        if embedding is None:
+            embedding = self.embedding_cache.put(text, await self.encoder.encode(text))
+        return embedding
     
     def _estimate_tokens(self, text: str) -> int:
         """Estimate token count (rough approximation)."""
         return len(text) // 4
     
+    def _embedding_text(self, question: str, answer: str) -> str:
+        """
+        Build the text to embed for a Q/A pair within the encoder's token limit.
+        
+        The question is kept from the start and long answers keep their last
+        characters, where the conclusion usually is. The stored document
+        always holds the full text.
+        
+        Args:
+            question: Question text
+            answer: Answer text
+            
+        Returns:
+            Text to pass to the embedding model
+        """
+        combined_text = f"Q: {question}\nA: {answer}"
+        if self._estimate_tokens(combined_text) > self.max_seq_length:
+            combined_text = f"Q: {question}\nA: {answer[-_EMBED_ANSWER_TAIL_CHARS:]}"
+        return combined_text
+    
     async def persist_interaction(
         self,
         session_id: str,
@@ -100,37 +540,26 @@ class RAGService:
             metadata=metadata or {}
         )
         
-        # Create combined text for embedding
+        # Create combined text for storage and embedding
         combined_text = f"Q: {question}\nA: {answer}"
         
         # Generate embedding
-        embedding = self._embed_text(combined_text)
+        embedding = await self._embed_text_async(self._embedding_text(question, answer))
         
-        # Create chunk ID
-        timestamp = datetime.utcnow().isoformat()
-        chunk_id = f"{session_id}_{timestamp}"
-        
-        # Prepare metadata for ChromaDB
-        chroma_metadata = {
-            "session_id": session_id,
-            "timestamp": timestamp,
-            "question": question[:500],  # Truncate for metadata limits
-            "answer": answer[:500]
-        }
-        
-        # Add custom metadata if provided
-        if metadata:
-            for key, value in metadata.items():
-                if isinstance(value, (str, int, float, bool)):
-                    chroma_metadata[f"custom_{key}"] = value
+        # Create chunk ID and ChromaDB metadata
+        now = datetime.utcnow()
+        chunk_id = f"{session_id}_{now.isoformat()}"
+        chroma_metadata = self._chunk_metadata(session_id, question, now, metadata)
         
         # Add to vector store
-        self.collection.add(
+        await asyncio.to_thread(
+            self.collection.add,
             ids=[chunk_id],
-            embeddings=[embedding],
+            embeddings=embedding[None, :],
             documents=[combined_text],
             metadatas=[chroma_metadata]
         )
+        self.query_cache.invalidate(session_id)
         
         logger.info(
             "Interaction persisted",
@@ -140,35 +569,81 @@ class RAGService:
         
         return chunk_id
     
-    def retrieve_context(
+    def _chunk_metadata(
+        self,
+        session_id: str,
+        question: str,
+        now: datetime,
+        metadata: Optional[Dict] = None
+    ) -> Dict:
+        """Build ChromaDB metadata for a newly stored chunk."""
+        chroma_metadata = {
+            "session_id": session_id,
+            "timestamp": now.isoformat(),
+            "ts_epoch": now.replace(tzinfo=timezone.utc).timestamp(),
+            "qhash": self._question_hash(question)
+        }
+        
+        # Add custom metadata if provided
+        if metadata:
+            for key, value in metadata.items():
+                if isinstance(value, (str, int, float, bool)):
+                    chroma_metadata[f"custom_{key}"] = value
+        
+        return chroma_metadata
+    
+    async def retrieve_context(
         self,
         query: str,
         session_id: str,
         top_k: int = 5,
         max_tokens: int = 4000,
-        recency_weight: float = 0.3
+        recency_weight: float = 0.3,
+        recall_mode: Literal["fast", "balanced", "high"] = "balanced"
     ) -> List[str]:
         """
         Retrieve relevant context chunks for a query.
         
+        The recall mode sets how many HNSW candidates are fetched for
+        recency re-ranking (ChromaDB 0.4 has no per-query ef_search; the
+        index searches with max(hnsw:search_ef, n_results)):
+        - fast: top_k candidates (max 20), lowest latency for interactive turns
+        - balanced: 2x top_k (max 50), the previous default
+        - high: 4x top_k (max 100), for recall-sensitive background work
+        
         Args:
             query: Search query
             session_id: Session to retrieve from
             top_k: Maximum number of chunks to retrieve
             max_tokens: Maximum total tokens to return
             recency_weight: Weight for recency in scoring (0-1)
+            recall_mode: Candidate budget, one of "fast", "balanced", "high"
             
         Returns:
             List of relevant context chunks
         """
-        # Generate query embedding
-        query_embedding = self._embed_text(query)
-        
-        # Query vector store with session filter
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=min(top_k * 2, 50),  # Get extra for filtering
-            where={"session_id": session_id}
+        # Generate query embedding (batched with concurrent requests)
+        query_embedding = await self._embed_text_async(query)
+        
+        # Reuse results of a near-identical recent query in the same scope
+        cache_scope = (session_id, top_k, max_tokens, recency_weight, recall_mode)
+        cached_chunks = self.query_cache.lookup(cache_scope, query_embedding)
+        if cached_chunks is not None:
+            logger.info(
+                "Context retrieved from query cache",
+                session_id=session_id,
+                chunks_found=len(cached_chunks)
+            )
+            return cached_chunks
+        
+        # Query vector store with session filter, fetching extra for re-ranking
+        fetch_factor, fetch_cap = _RECALL_MODES[recall_mode]
+        results = await asyncio.to_thread(
+            self.collection.query,
+            query_embeddings=query_embedding[None, :],
+            n_results=min(top_k * fetch_factor, fetch_cap),
+            where=_session_where(session_id),
+            include=_QUERY_INCLUDE
         )
         
         if not results['documents'] or not results['documents'][0]:
@@ -179,37 +654,27 @@ class RAGService:
         metadatas = results['metadatas'][0]
         distances = results['distances'][0]
         
-        # Calculate recency-weighted scores
-        scored_chunks = []
-        for i, (chunk, metadata, distance) in enumerate(zip(chunks, metadatas, distances)):
-            # Parse timestamp
-            try:
-                timestamp = datetime.fromisoformat(metadata['timestamp'])
-                age_seconds = (datetime.utcnow() - timestamp).total_seconds()
-                age_hours = age_seconds / 3600
-                
-                # Recency factor (decays over time)
-                recency_factor = 1.0 / (1.0 + age_hours / 24.0)
-            except:
-                recency_factor = 0.5
-            
-            # Combine similarity score with recency
-            similarity_score = 1.0 - distance  # Convert distance to similarity
-            final_score = (
-                (1 - recency_weight) * similarity_score +
-                recency_weight * recency_factor
-            )
-            
-            scored_chunks.append((chunk, final_score, metadata))
+        # Calculate recency-weighted scores in one vectorized pass
+        now = time.time()
+        age_hours = np.fromiter(
+            (self._age_hours(metadata, now) for metadata in metadatas),
+            dtype=np.float64,
+            count=len(metadatas)
+        )
+        # Recency factor decays over time; unknown ages count as 0.5
+        recency = np.where(np.isnan(age_hours), 0.5, 1.0 / (1.0 + age_hours / 24.0))
+        similarity = 1.0 - np.asarray(distances, dtype=np.float64)
+        scores = (1 - recency_weight) * similarity + recency_weight * recency
         
-        # Sort by final score
-        scored_chunks.sort(key=lambda x: x[1], reverse=True)
+        # Highest score first (stable for ties, like list.sort)
+        order = np.argsort(-scores, kind="stable")[:top_k]
         
         # Select top chunks within token limit
         selected_chunks = []
         total_tokens = 0
         
-        for chunk, score, metadata in scored_chunks[:top_k]:
+        for i in order:
+            chunk = chunks[i]
             chunk_tokens = self._estimate_tokens(chunk)
             if total_tokens + chunk_tokens <= max_tokens:
                 selected_chunks.append(chunk)
@@ -219,6 +684,7 @@ class RAGService:
         
         # Deduplicate
         selected_chunks = self._deduplicate_chunks(selected_chunks)
+        self.query_cache.store(cache_scope, query_embedding, selected_chunks)
         
         logger.info(
             "Context retrieved",
@@ -230,14 +696,46 @@ class RAGService:
         
         return selected_chunks
     
+    @staticmethod
+    def _question_hash(question: str) -> str:
+        """Short normalized hash of a question, stored as chunk metadata for lookups."""
+        return xxhash.xxh64_hexdigest(question.strip().lower())
+    
+    @staticmethod
+    def _age_hours(metadata: Dict, now: float) -> float:
+        """
+        Age of a chunk in hours (NaN if unknown).
+        
+        Reads the ts_epoch written at persist time; chunks stored before
+        ts_epoch existed fall back to parsing the ISO timestamp.
+        
+        Args:
+            metadata: Chunk metadata from ChromaDB
+            now: Current Unix time in seconds
+            
+        Returns:
+            Age in hours
+        """
+        ts_epoch = metadata.get('ts_epoch') if metadata else None
+        if ts_epoch is not None:
+            return (now - ts_epoch) / 3600
+        
+        try:
+            timestamp = datetime.fromisoformat(metadata['timestamp'])
+            epoch = timestamp.replace(tzinfo=timestamp.tzinfo or timezone.utc).timestamp()
+            return (now - epoch) / 3600
+        except (KeyError, TypeError, ValueError):
+            return float("nan")
+    
     def _deduplicate_chunks(self, chunks: List[str]) -> List[str]:
         """Remove duplicate or very similar chunks."""
         seen_hashes = set()
         unique_chunks = []
         
         for chunk in chunks:
-            # Create hash of chunk
-            chunk_hash = hashlib.md5(chunk.encode()).hexdigest()
+            # 64-bit xxh3 of the whole chunk (chunks sharing a long question
+            # prefix can still differ in the answer)
+            chunk_hash = xxhash.xxh3_64_intdigest(chunk.encode())
             
             if chunk_hash not in seen_hashes:
                 seen_hashes.add(chunk_hash)
@@ -255,7 +753,7 @@ class RAGService:
         Returns:
             Dictionary with collection statistics
         """
-        total_count = self.collection.count()
+        total_count = self.collection_count
         
         stats = {
             'total_chunks': total_count,
@@ -266,7 +764,7 @@ class RAGService:
         if session_id:
             # Count chunks for specific session
             results = self.collection.get(
-                where={"session_id": session_id}
+                where=_session_where(session_id)
             )
             session_count = len(results['ids']) if results['ids'] else 0
             stats['session_id'] = session_id
@@ -300,26 +798,41 @@ class RAGService:
         # Find the chunk to update
         old_combined_text = f"Q: {question}\nA: {old_answer}"
         
-        # Query to find the exact chunk
-        results = self.collection.get(
-            where={"session_id": session_id}
+        # Look the chunk up server-side by question hash
+        results = await asyncio.to_thread(
+            self.collection.get,
+            where={"$and": [
+                {"session_id": session_id},
+                {"qhash": self._question_hash(question)}
+            ]},
+            include=["metadatas"]
         )
+        chunk_id_to_update = results['ids'][0] if results['ids'] else None
+        previous_metadata = results['metadatas'][0] if results['ids'] else None
         
-        if not results['ids']:
-            logger.warning(
-                "No chunks found for session",
-                session_id=session_id
+        if not chunk_id_to_update:
+            # Chunks stored before qhash existed: scan the session's documents
+            results = await asyncio.to_thread(
+                self.collection.get,
+                where=_session_where(session_id),
+                include=["documents", "metadatas"]
             )
-            return False
-        
-        # Find matching chunk by comparing documents
-        chunk_id_to_update = None
-        if results['documents']:
-            for i, doc in enumerate(results['documents']):
-                # Match by question (more reliable than full text match)
-                if question in doc:
-                    chunk_id_to_update = results['ids'][i]
-                    break
+            
+            if not results['ids']:
+                logger.warning(
+                    "No chunks found for session",
+                    session_id=session_id
+                )
+                return False
+            
+            # Find matching chunk by comparing documents
+            if results['documents']:
+                for i, doc in enumerate(results['documents']):
+                    # Match by question (more reliable than full text match)
+                    if question in doc:
+                        chunk_id_to_update = results['ids'][i]
+                        previous_metadata = results['metadatas'][i]
+                        break
         
         if not chunk_id_to_update:
             logger.warning(
@@ -329,23 +842,22 @@ class RAGService:
             )
             return False
         
-        # Delete old chunk
-        self.collection.delete(ids=[chunk_id_to_update])
-        
-        # Create new chunk with updated answer
+        # Re-embed the chunk with the updated answer
         new_combined_text = f"Q: {question}\nA: {new_answer}"
-        embedding = self._embed_text(new_combined_text)
+        embedding = await self._embed_text_async(self._embedding_text(question, new_answer))
         
-        timestamp = datetime.utcnow().isoformat()
-        new_chunk_id = f"{session_id}_{timestamp}_edited"
+        now = datetime.utcnow()
+        ts_epoch = now.replace(tzinfo=timezone.utc).timestamp()
         
-        # Prepare metadata
+        # Prepare metadata (edit history lives in metadata; the id is kept)
         chroma_metadata = {
             "session_id": session_id,
-            "timestamp": timestamp,
-            "question": question[:500],
-            "answer": new_answer[:500],
-            "edited": "true"
+            "timestamp": now.isoformat(),
+            "ts_epoch": ts_epoch,
+            "qhash": self._question_hash(question),
+            "edited": "true",
+            "edited_count": int((previous_metadata or {}).get("edited_count", 0)) + 1,
+            "last_edited_ts": ts_epoch
         }
         
         if metadata:
@@ -353,19 +865,21 @@ class RAGService:
                 if isinstance(value, (str, int, float, bool)):
                     chroma_metadata[f"custom_{key}"] = str(value)
         
-        # Add updated chunk
-        self.collection.add(
-            ids=[new_chunk_id],
-            embeddings=[embedding],
+        # Update the chunk in place
+        await asyncio.to_thread(
+            self.collection.update,
+            ids=[chunk_id_to_update],
+            embeddings=embedding[None, :],
             documents=[new_combined_text],
             metadatas=[chroma_metadata]
         )
+        self.query_cache.invalidate(session_id)
         
         logger.info(
             "Interaction updated",
             session_id=session_id,
-            old_chunk_id=chunk_id_to_update,
-            new_chunk_id=new_chunk_id
+            chunk_id=chunk_id_to_update,
+            edited_count=chroma_metadata["edited_count"]
         )
         
         # Also update markdown storage
@@ -379,7 +893,7 @@ class RAGService:
         
         return True
     
-    def delete_session_chunks(self, session_id: str) -> int:
+    async def delete_session_chunks(self, session_id: str) -> int:
         """
         Delete all chunks for a session.
         
@@ -389,38 +903,38 @@ class RAGService:
         Returns:
             Number of chunks deleted
         """
-        # Get all chunks for session
-        results = self.collection.get(
-            where={"session_id": session_id}
+        # Delete exactly the chunks matched now, so the count is unaffected
+        # by other sessions writing concurrently
+        matched = await asyncio.to_thread(
+            self.collection.get,
+            where=_session_where(session_id),
+            include=[]
         )
-        
-        if not results['ids']:
+        chunk_ids = matched["ids"]
+        if not chunk_ids:
             return 0
         
-        # Delete chunks
-        self.collection.delete(
-            ids=results['ids']
-        )
-        
-        deleted_count = len(results['ids'])
+        await asyncio.to_thread(self.collection.delete, ids=chunk_ids)
+        self.query_cache.invalidate(session_id)
         
         logger.info(
             "Session chunks deleted",
             session_id=session_id,
-            count=deleted_count
+            count=len(chunk_ids)
         )
         
-        return deleted_count
+        return len(chunk_ids)
     
     def clear_collection(self) -> None:
         """Clear all data from the collection."""
         # Delete collection
-        self.chroma_client.delete_collection("conversations")
+        self.chroma_client.delete_collection(_COLLECTION_NAME)
+        self.query_cache.invalidate()
         
-        # Recreate collection
-        self.collection = self.chroma_client.get_or_create_collection(
-            name="conversations",
-            metadata={"hnsw:space": "cosine"}
+        # Recreate collection with the current configuration
+        self.collection = self.chroma_client.create_collection(
+            name=_COLLECTION_NAME,
+            metadata=self._collection_metadata()
         )
         
         logger.info("Collection cleared")
@@ -11,11 +11,15 @@ import numpy as np
 from sentence_transformers import SentenceTransformer
 import faiss
 import structlog
+import torch
 
 from storage.conversation_storage import ConversationStorage
 
 logger = structlog.get_logger()
 
+# Vectors are buffered and added to the index in batches of this size
+_ADD_BATCH_SIZE = 256
+
 
 class RAGService:
     """
@@ -49,17 +53,27 @@ class RAGService:
         
         # Initialize sentence transformer model
         logger.info("loading_sentence_transformer", model=model_name)
-        self.model = SentenceTransformer(model_name)
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.model = SentenceTransformer(model_name, device=device)
+        self.model.eval()
         self.dimension = self.model.get_sentence_embedding_dimension()
         
-        # Initialize FAISS index (L2 distance)
-        self.index = faiss.IndexFlatL2(self.dimension)
+        # Initialize FAISS index (HNSW graph, inner product on unit vectors)
+        self.index = faiss.IndexHNSWFlat(
+            self.dimension, 24, faiss.METRIC_INNER_PRODUCT
+        )
+        self.index.hnsw.efConstruction = 128
+        self.index.hnsw.efSearch = 100
         
         # In-memory storage for chunks and metadata
         self.chunks: List[str] = []
         self.chunk_metadata: List[Dict] = []
         self.session_chunk_map: Dict[str, List[int]] = {}  # session_id -> chunk indices
         
+        # Embeddings not yet added to the index (see flush)
+        self._pending_vecs: List[np.ndarray] = []
+        self._pending_ids: List[int] = []
+        
         logger.info(
             "rag_service_initialized",
             model=model_name,
@@ -77,8 +91,9 @@ class RAGService:
             Normalized embedding vector
         """
         try:
-            embedding = self.model.encode([text])[0]
-            # Normalize for cosine similarity via L2 distance
+            with torch.inference_mode():
+                embedding = self.model.encode([text])[0]
+            # Normalize so inner product equals cosine similarity
             norm = np.linalg.norm(embedding)
             if norm > 0:
                 embedding = embedding / norm
@@ -120,11 +135,14 @@ class RAGService:
         # Generate embedding
         embedding = self.embed_text(chunk_text)
         
-        # Add to FAISS index
-        self.index.add(np.array([embedding], dtype=np.float32))
-        
         # Store chunk and metadata
         chunk_idx = len(self.chunks)
+        
+        # Buffer for the FAISS index; added in batches by flush()
+        self._pending_vecs.append(embedding.astype(np.float32, copy=False))
+        self._pending_ids.append(chunk_idx)
+        if len(self._pending_vecs) >= _ADD_BATCH_SIZE:
+            self.flush()
         self.chunks.append(chunk_text)
         
         chunk_meta = {
@@ -183,25 +201,25 @@ class RAGService:
             # Embed query
             query_embedding = self.embed_text(query)
             
-            # Search in full index
-            k = min(top_k * 2, len(self.chunks))  # Get more candidates
+            # Make buffered interactions searchable
+            self.flush()
+            
+            # Search only this session's chunks; FAISS ids are chunk indices
+            sel = faiss.IDSelectorBatch(
+                np.asarray(session_chunk_indices, dtype=np.int64)
+            )
+            k = min(top_k * 2, len(session_chunk_indices))  # Get more candidates
             distances, indices = self.index.search(
                 np.array([query_embedding], dtype=np.float32),
-                k
+                k,
+                params=faiss.SearchParametersHNSW(sel=sel)
             )
             
-            # Filter to only chunks from this session
             relevant_chunks = []
             total_tokens = 0
             
-            for idx in indices[0]:
-                if idx >= len(self.chunk_metadata):
-                    continue
-                
-                meta = self.chunk_metadata[idx]
-                
-                # Only include chunks from this session
-                if meta['session_id'] != session_id:
+            for distance, idx in zip(distances[0], indices[0]):
+                if idx < 0:
                     continue
                 
                 chunk = self.chunks[idx]
@@ -212,8 +230,9 @@ class RAGService:
                 if total_tokens + chunk_tokens <= max_tokens:
                     relevant_chunks.append({
                         'text': chunk,
-                        'metadata': meta,
-                        'distance': float(distances[0][list(indices[0]).index(idx)])
+                        'metadata': self.chunk_metadata[idx],
+                        # Index returns inner product; convert to cosine distance
+                        'distance': 1.0 - float(distance)
                     })
                     total_tokens += chunk_tokens
                 
@@ -267,9 +286,8 @@ class RAGService:
             # Recent chunks (< 1 hour) get high scores
             recency_score = np.exp(-time_diff / 3600)
             
-            # Combine distance (lower is better) with recency
-            # Normalize distance to 0-1 range
-            similarity_score = 1 / (1 + chunk['distance'])
+            # Combine cosine distance (lower is better) with recency
+            similarity_score = 1 - chunk['distance']
             
             # Combined score (70% similarity, 30% recency)
             chunk['score'] = 0.7 * similarity_score + 0.3 * recency_score
@@ -279,6 +297,33 @@ class RAGService:
         
         return chunks
     
+    def flush(self) -> int:
+        """
+        Add buffered embeddings to the FAISS index in one call.
+        
+        Returns:
+            Number of vectors added
+        """
+        if not self._pending_vecs:
+            return 0
+        
+        # FAISS assigns sequential ids, which match the buffered chunk indices
+        first_id = self._pending_ids[0]
+        self.index.add(np.vstack(self._pending_vecs))
+        
+        count = len(self._pending_vecs)
+        self._pending_vecs = []
+        self._pending_ids = []
+        
+        logger.debug(
+            "index_flushed",
+            first_id=first_id,
+            vectors_added=count,
+            index_size=self.index.ntotal
+        )
+        
+        return count
+    
     def _deduplicate_chunks(self, chunks: List[Dict]) -> List[Dict]:
         """
         Remove very similar chunks (likely duplicates).
@@ -296,8 +341,8 @@ class RAGService:
         seen_hashes = set()
         
         for chunk in chunks:
-            # Create a hash from first 100 chars of text
-            chunk_hash = hash(chunk['text'][:100])
+            # Create a hash from first 256 chars of text
+            chunk_hash = hash(chunk['text'][:256])
             
             if chunk_hash not in seen_hashes:
                 seen_hashes.add(chunk_hash)
@@ -365,6 +410,7 @@ class RAGService:
             'total_chunks': len(self.chunks),
             'total_sessions': len(self.session_chunk_map),
             'index_size': self.index.ntotal,
+            'pending_vectors': len(self._pending_vecs),
             'embedding_dimension': self.dimension,
             'model_name': self.model_name
         }
@@ -14,22 +14,202 @@ SOLID Principles:
 - Dependency Inversion: Could abstract storage interface
 """
 
-import json
-import aiofiles
+import asyncio
+import hashlib
+import heapq
+import orjson
+import os
+from collections import deque
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
-from datetime import datetime
+from typing import Deque, List, Optional, Dict, Tuple, Union
+from datetime import datetime, timedelta, timezone
 import structlog
 
 from models.conversation import (
     Session,
     Message,
     MessageRole,
-    ConversationState
+    ConversationState,
+    QUESTION_ROLES
 )
 
 logger = structlog.get_logger()
 
+# Message timestamps are stored as integer milliseconds since this (naive UTC)
+# epoch, which is cheaper to write and read back than ISO 8601 strings
+_EPOCH = datetime(1970, 1, 1)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def _to_epoch_ms(dt: datetime) -> int:
+    """Convert a (naive UTC or aware) datetime to epoch milliseconds."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // _MILLISECOND
+
+
+# Session files start with a compact one-line summary so list_sessions can
+# read just the first few KB instead of parsing the whole file:
+#   {"__header__":{...summary...},
+#   "id": ...   (rest of the session object, compact or indented)
+_HEADER_PREFIX = b'{"__header__":'
+_HEADER_READ_BYTES = 4096
+
+# Messages live in an append-only {id}.jsonl log next to the {id}.json
+# header, one record per line; a later record for the same message id
+# (an edit) replaces the earlier one on load. The log is rewritten without
+# superseded records once it holds more than this many records per message.
+_LOG_COMPACT_RATIO = 2
+
+# orjson options for session files (compact) and exports / pretty saves
+_ORJSON_OPTS_COMPACT = 0
+_ORJSON_OPTS_PRETTY = _ORJSON_OPTS_COMPACT | orjson.OPT_INDENT_2
+
+# Stored enum values -> members; plain dict lookups skip Enum.__call__
+_ROLE_MAP = MessageRole._value2member_map_
+_STATE_MAP = ConversationState._value2member_map_
+
+# Maximum session files read concurrently by list_sessions
+_LIST_READ_CONCURRENCY = 32
+
+# Maximum queued file writes performed in one worker-thread hop
+_WRITE_BATCH_SIZE = 32
+
+# fdatasync skips flushing unchanged inode metadata; not available on macOS
+_fdatasync = getattr(os, 'fdatasync', os.fsync)
+
+
+def _write_atomic(filepath: Path, data: bytes) -> None:
+    """Write a file via a synced temporary sibling and rename, so readers never see a partial file."""
+    tmp_path = filepath.with_name(filepath.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        _fdatasync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+
+def _append_bytes(filepath: Path, data: bytes) -> None:
+    """Append bytes to a file, creating it if needed, and sync it (blocking)."""
+    with open(filepath, 'ab') as f:
+        f.write(data)
+        f.flush()
+        _fdatasync(f.fileno())
+
+
+def _sync_directory(directory: Path) -> None:
+    """Persist renames and new entries in a directory (no-op where unsupported)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_batch(batch: List[Tuple[Path, bytes, bool]]) -> List[Optional[Exception]]:
+    """
+    Perform queued writes in order, then sync their directories once (blocking).
+    
+    Each file is still fdatasync'd individually by its write; only the
+    thread hop and the directory fsync are shared by the batch.
+    
+    Args:
+        batch: (path, data, append) per write; append=False replaces the file
+        
+    Returns:
+        The exception raised by each write, or None if it succeeded
+    """
+    errors: List[Optional[Exception]] = []
+    directories = set()
+    for filepath, data, append in batch:
+        try:
+            if append:
+                _append_bytes(filepath, data)
+            else:
+                _write_atomic(filepath, data)
+            directories.add(filepath.parent)
+            errors.append(None)
+        except Exception as e:
+            errors.append(e)
+    for directory in directories:
+        _sync_directory(directory)
+    return errors
+
+
+def _line_digest(line: bytes) -> bytes:
+    """Hash a serialized message record."""
+    return hashlib.blake2b(line, digest_size=16).digest()
+
+
+def _message_record(msg: Message) -> Dict:
+    """Build the stored form of a message."""
+    return {
+        'id': msg.id,
+        'session_id': msg.session_id,
+        'role': msg.role.value,
+        'content': msg.content,
+        'timestamp': _to_epoch_ms(msg.timestamp),
+        'metadata': msg.metadata
+    }
+
+
+def _read_message_log(log_path: Path) -> Tuple[Dict[str, Dict], int]:
+    """
+    Parse a message log line by line (blocking).
+    
+    Only one raw line is held at a time rather than the whole file. Later
+    records for a message id supersede earlier ones in place.
+    
+    Returns:
+        Tuple of (message id -> latest record, number of records in the log)
+    """
+    records: Dict[str, Dict] = {}
+    log_records = 0
+    with open(log_path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                record = orjson.loads(line)
+                records[record['id']] = record
+                log_records += 1
+    return records, log_records
+
+
+def _session_data(session: Session, messages: List[Message]) -> Dict:
+    """
+    Build the stored form of a session's metadata (without messages).
+    
+    The question and message counts come from the messages themselves,
+    so they are right however the Session object was built.
+    """
+    return {
+        'id': session.id,
+        'started_at': session.started_at,
+        'last_updated': session.last_updated,
+        'status': session.status,
+        'state': session.state.value,
+        'investigation_progress': session.investigation_progress,
+        'metadata': {
+            **session.metadata,
+            'question_count': sum(1 for msg in messages if msg.role in QUESTION_ROLES),
+            'message_count': len(messages)
+        },
+        'provider': session.provider,
+        'model_id': session.model_id,
+        'skipped_questions': session.skipped_questions
+    }
+
+
+def _from_epoch_ms(value: Union[int, str]) -> datetime:
+    """Convert stored epoch milliseconds (or a legacy ISO string) to naive UTC."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return _EPOCH + value * _MILLISECOND
+
 
 class SessionService:
     """
@@ -49,6 +229,18 @@ class SessionService:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
         
+        # session_id -> (file mtime_ns, summary) for list_sessions
+        self._meta_cache: Dict[str, Tuple[int, Dict]] = {}
+        # session_id -> content hash of the last save (excluding save timestamps)
+        self._last_hash: Dict[str, bytes] = {}
+        # session_id -> {message_id: record digest} of messages in the log,
+        # and the number of records (lines) the log holds
+        self._logged: Dict[str, Dict[str, bytes]] = {}
+        self._log_records: Dict[str, int] = {}
+        # Writes waiting for the writer task: (path, data, append, future)
+        self._pending_writes: Deque[Tuple[Path, bytes, bool, asyncio.Future]] = deque()
+        self._writer_task: Optional[asyncio.Task] = None
+        
         logger.info(
             "session_service_initialized",
             base_dir=str(self.base_dir)
@@ -57,66 +249,98 @@ class SessionService:
     async def save_session(
         self,
         session: Session,
-        messages: List[Message]
+        messages: List[Message],
+        pretty: bool = False
     ) -> bool:
         """
-        Save session to JSON file.
+        Save session to its JSON header file and JSONL message log.
+        
+        Session metadata is written to {id}.json; messages that are new or
+        changed since the last save are appended to {id}.jsonl. The log is
+        rewritten in full on the first save by this service, when messages
+        were removed, or when superseded records dominate it. Updates the
+        session's last_updated timestamp automatically. Saves with no
+        changes are skipped, and rewrites replace files atomically.
         
-        Serializes session metadata and full message history to a JSON file.
-        Updates the session's last_updated timestamp automatically.
+        The JSON file is written compactly unless `pretty` is set; use
+        export_session() for a human-readable copy of a session.
         
         Args:
             session: Session object to save
             messages: List of messages in the session
+            pretty: Indent the session JSON file (larger and slower to parse)
             
         Returns:
             True if save successful, False otherwise
         """
         try:
             filepath = self.base_dir / f"{session.id}.json"
+            log_path = self._log_path(session.id)
+            
+            # Build session data structure
+            session_data = _session_data(session, messages)
+            question_count = session_data['metadata']['question_count']
+            session_data['last_updated'] = None  # Set below, after the content hash
+            
+            # Work out which message records the log is missing
+            lines = [orjson.dumps(_message_record(msg)) for msg in messages]
+            digests = {msg.id: _line_digest(line) for msg, line in zip(messages, lines)}
+            logged = self._logged.get(session.id)
+            rewrite_log = (
+                logged is None
+                or not log_path.exists()
+                or not logged.keys() <= digests.keys()
+            )
+            new_lines = [] if rewrite_log else [
+                line for msg, line in zip(messages, lines)
+                if logged.get(msg.id) != digests[msg.id]
+            ]
+            log_records = len(lines) if rewrite_log else self._log_records[session.id] + len(new_lines)
+            if log_records > _LOG_COMPACT_RATIO * max(len(lines), 1):
+                rewrite_log = True
+                log_records = len(lines)
+            
+            # Skip the write when nothing but the save timestamps would change
+            content_hash = hashlib.blake2b(
+                orjson.dumps(session_data), digest_size=16
+            ).digest()
+            if (
+                not rewrite_log
+                and not new_lines
+                and self._last_hash.get(session.id) == content_hash
+                and filepath.exists()
+            ):
+                logger.info("session_save_skipped_unchanged", session_id=session.id)
+                return True
             
             # Update session timestamp
             session.last_updated = datetime.utcnow()
+            session_data['last_updated'] = session.last_updated
+            session_data['metadata']['saved_at'] = session.last_updated
             
-            # Count questions (messages with ASSISTANT/SYSTEM role)
-            question_count = len([
-                msg for msg in messages 
-                if msg.role in (MessageRole.ASSISTANT, MessageRole.SYSTEM)
-            ])
+            # Messages first, so a header never describes unwritten messages
+            if rewrite_log:
+                await self._write(log_path, b''.join(line + b'\n' for line in lines))
+            elif new_lines:
+                await self._write(
+                    log_path, b''.join(line + b'\n' for line in new_lines), append=True
+                )
+            self._logged[session.id] = digests
+            self._log_records[session.id] = log_records
             
-            # Build session data structure
-            session_data = {
-                'id': session.id,
-                'started_at': session.started_at.isoformat(),
-                'last_updated': session.last_updated.isoformat(),
-                'status': session.status,
-                'state': session.state.value,
-                'investigation_progress': session.investigation_progress,
-                'metadata': {
-                    **session.metadata,
-                    'question_count': question_count,
-                    'message_count': len(messages),
-                    'saved_at': datetime.utcnow().isoformat()
-                },
-                'provider': session.provider,
-                'model_id': session.model_id,
-                'skipped_questions': session.skipped_questions,
-                'messages': [
-                    {
-                        'id': msg.id,
-                        'session_id': msg.session_id,
-                        'role': msg.role.value,
-                        'content': msg.content,
-                        'timestamp': msg.timestamp.isoformat(),
-                        'metadata': msg.metadata
-                    }
-                    for msg in messages
-                ]
-            }
-            
-            # Write to file with pretty formatting
-            async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(session_data, indent=2))
+            # Summary header line followed by the rest of the session object
+            # (orjson emits datetimes as ISO 8601 and returns UTF-8 bytes);
+            # an indented body already starts on a new line
+            header = orjson.dumps(self._session_summary(session_data))
+            if pretty:
+                body = orjson.dumps(session_data, option=_ORJSON_OPTS_PRETTY)
+                separator = b','
+            else:
+                body = orjson.dumps(session_data, option=_ORJSON_OPTS_COMPACT)
+                separator = b',\n'
+            self._meta_cache.pop(session.id, None)
+            await self._write(filepath, _HEADER_PREFIX + header + separator + body[1:])
+            self._last_hash[session.id] = content_hash
             
             logger.info(
                 "session_saved",
@@ -137,15 +361,69 @@ class SessionService:
             )
             return False
     
+    async def _write(self, filepath: Path, data: bytes, append: bool = False) -> None:
+        """
+        Queue a durable file write and wait until it has been synced.
+        
+        Writes from concurrent saves are batched: the writer task performs
+        up to _WRITE_BATCH_SIZE queued writes in one worker-thread hop. Each
+        file is fdatasync'd on its own; the batch shares only the thread hop
+        and one fsync of the directory.
+        
+        Args:
+            filepath: File to write
+            data: Bytes to write
+            append: Append to the file instead of atomically replacing it
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        writer = self._writer_task
+        if writer is None or writer.done() or writer.get_loop() is not loop:
+            # Writes queued on another (closed) event loop can never complete
+            self._pending_writes.clear()
+            self._pending_writes.append((filepath, data, append, future))
+            self._writer_task = loop.create_task(self._writer_loop())
+        else:
+            self._pending_writes.append((filepath, data, append, future))
+        
+        await future
+    
+    async def _writer_loop(self) -> None:
+        """Drain queued writes in batches; exits once the queue is empty."""
+        while self._pending_writes:
+            batch = []
+            while self._pending_writes and len(batch) < _WRITE_BATCH_SIZE:
+                batch.append(self._pending_writes.popleft())
+            
+            try:
+                errors = await asyncio.to_thread(
+                    _write_batch, [(path, data, append) for path, data, append, _ in batch]
+                )
+            except Exception as e:
+                errors = [e] * len(batch)
+            
+            for (_, _, _, future), error in zip(batch, errors):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+            
+            if len(batch) > 1:
+                logger.debug("session_writes_batched", write_count=len(batch))
+    
     async def load_session(
         self,
         session_id: str
     ) -> Optional[Tuple[Session, List[Message]]]:
         """
-        Load session from JSON file.
+        Load session from its JSON header file and JSONL message log.
         
         Deserializes session metadata and message history, fully restoring
-        the conversation state.
+        the conversation state. Sessions saved before the message log existed
+        are read from the messages embedded in the JSON file.
         
         Args:
             session_id: Unique session identifier
@@ -165,9 +443,20 @@ class SessionService:
                 return None
             
             # Read session data
-            async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                session_data = json.loads(content)
+            session_data = orjson.loads(await asyncio.to_thread(filepath.read_bytes))
+            
+            log_path = self._log_path(session_id)
+            if log_path.exists():
+                records, log_records = await asyncio.to_thread(_read_message_log, log_path)
+                message_records = list(records.values())
+                self._logged[session_id] = {
+                    message_id: _line_digest(orjson.dumps(record))
+                    for message_id, record in records.items()
+                }
+                self._log_records[session_id] = log_records
+            else:
+                message_records = session_data.get('messages', [])
+                self._logged.pop(session_id, None)
             
             # Reconstruct Session object
             session = Session(
@@ -175,7 +464,7 @@ class SessionService:
                 started_at=datetime.fromisoformat(session_data['started_at']),
                 last_updated=datetime.fromisoformat(session_data['last_updated']),
                 status=session_data['status'],
-                state=ConversationState(session_data['state']),
+                state=_STATE_MAP[session_data['state']],
                 investigation_progress=session_data.get('investigation_progress', {}),
                 metadata=session_data.get('metadata', {}),
                 provider=session_data.get('provider'),
@@ -183,17 +472,25 @@ class SessionService:
                 skipped_questions=session_data.get('skipped_questions', [])
             )
             
+            if 'question_count' in session.metadata:
+                session.question_count = session.metadata['question_count']
+            else:
+                session.question_count = sum(
+                    1 for msg_data in message_records
+                    if msg_data['role'] in QUESTION_ROLES
+                )
+            
             # Reconstruct Message objects
             messages = [
                 Message(
                     id=msg_data['id'],
                     session_id=msg_data['session_id'],
-                    role=MessageRole(msg_data['role']),
+                    role=_ROLE_MAP[msg_data['role']],
                     content=msg_data['content'],
-                    timestamp=datetime.fromisoformat(msg_data['timestamp']),
+                    timestamp=_from_epoch_ms(msg_data['timestamp']),
                     metadata=msg_data.get('metadata', {})
                 )
-                for msg_data in session_data.get('messages', [])
+                for msg_data in message_records
             ]
             
             logger.info(
@@ -215,66 +512,103 @@ class SessionService:
             )
             return None
     
+    async def export_session(self, session_id: str) -> Optional[bytes]:
+        """
+        Export a session as a single, human-readable JSON document.
+        
+        Unlike the compact files written by save_session, the export is
+        indented and embeds the session's messages, so it can be shared
+        or inspected on its own.
+        
+        Args:
+            session_id: Unique session identifier
+            
+        Returns:
+            Indented UTF-8 JSON bytes if the session exists, None otherwise
+        """
+        loaded = await self.load_session(session_id)
+        if loaded is None:
+            return None
+        
+        session, messages = loaded
+        export_data = _session_data(session, messages)
+        export_data['messages'] = [_message_record(msg) for msg in messages]
+        
+        logger.info(
+            "session_exported",
+            session_id=session_id,
+            message_count=len(messages)
+        )
+        return orjson.dumps(export_data, option=_ORJSON_OPTS_PRETTY)
+    
     async def list_sessions(
         self,
         limit: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[Dict]:
         """
         List all saved sessions with metadata.
         
-        Returns session summaries sorted by last_updated (most recent first).
-        Useful for session picker UI.
+        Returns session summaries sorted by last save (most recent first).
+        Files are ordered by modification time before any are read, so only
+        the requested page is opened. Useful for session picker UI.
         
         Args:
             limit: Maximum number of sessions to return (None = all)
             offset: Number of sessions to skip (for pagination)
+            cursor: ID of the last session on the previous page; when given,
+                listing continues after it (stable across concurrent saves)
             
         Returns:
             List of session metadata dictionaries
         """
         try:
-            sessions = []
+            files = self._scan_session_files()
             
-            # Scan all JSON files in the sessions directory
-            for filepath in self.base_dir.glob("*.json"):
-                try:
-                    async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
-                        content = await f.read()
-                        data = json.loads(content)
-                    
-                    # Extract summary metadata
-                    sessions.append({
-                        'id': data['id'],
-                        'started_at': data['started_at'],
-                        'last_updated': data['last_updated'],
-                        'status': data['status'],
-                        'state': data['state'],
-                        'question_count': data.get('metadata', {}).get('question_count', 0),
-                        'message_count': data.get('metadata', {}).get('message_count', 0),
-                        'provider': data.get('provider'),
-                        'model_id': data.get('model_id')
-                    })
-                    
-                except Exception as e:
+            if cursor is not None:
+                cursor_key = next((key for key, _ in files if key[1] == cursor), None)
+                if cursor_key is None:
+                    logger.warning("session_cursor_not_found", cursor=cursor)
+                else:
+                    files = [f for f in files if f[0] < cursor_key]
+            
+            # Select the page by (mtime, id) without sorting every file
+            if limit is not None:
+                files = heapq.nlargest(offset + limit, files)[offset:]
+            else:
+                files = sorted(files, reverse=True)[offset:]
+            
+            # Read the page's headers concurrently, bounded by a semaphore
+            semaphore = asyncio.Semaphore(_LIST_READ_CONCURRENCY)
+            
+            async def read_summary(key: Tuple[int, str], filepath: Path) -> Dict:
+                # Unchanged files (same mtime) reuse their cached summary
+                mtime_ns, session_id = key
+                cached = self._meta_cache.get(session_id)
+                if cached is not None and cached[0] == mtime_ns:
+                    return dict(cached[1])
+                
+                async with semaphore:
+                    summary = await asyncio.to_thread(self._read_session_summary, filepath)
+                self._meta_cache[session_id] = (mtime_ns, summary)
+                return dict(summary)
+            
+            results = await asyncio.gather(
+                *(read_summary(key, filepath) for key, filepath in files),
+                return_exceptions=True
+            )
+            
+            sessions = []
+            for (_, filepath), result in zip(files, results):
+                if isinstance(result, Exception):
                     logger.warning(
                         "session_read_error",
                         filepath=str(filepath),
-                        error=str(e)
+                        error=str(result)
                     )
                     continue
-            
-            # Sort by last_updated (most recent first)
-            sessions.sort(
-                key=lambda x: x['last_updated'],
-                reverse=True
-            )
-            
-            # Apply pagination
-            if limit is not None:
-                sessions = sessions[offset:offset + limit]
-            elif offset > 0:
-                sessions = sessions[offset:]
+                sessions.append(result)
             
             logger.info(
                 "sessions_listed",
@@ -293,11 +627,84 @@ class SessionService:
             )
             return []
     
+    def _log_path(self, session_id: str) -> Path:
+        """Path of a session's JSONL message log."""
+        return self.base_dir / f"{session_id}.jsonl"
+    
+    def _scan_session_files(self) -> List[Tuple[Tuple[int, str], Path]]:
+        """
+        List session files with their (mtime_ns, session_id) sort keys.
+        
+        Returns:
+            List of ((mtime_ns, session_id), filepath) tuples, unordered
+        """
+        files = []
+        with os.scandir(self.base_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or not entry.is_file():
+                    continue
+                try:
+                    key = (entry.stat().st_mtime_ns, entry.name[:-len('.json')])
+                except OSError:
+                    # Deleted between listing and stat
+                    continue
+                files.append((key, Path(entry.path)))
+        return files
+    
+    @staticmethod
+    def _session_summary(data: Dict) -> Dict:
+        """
+        Extract the summary fields shown in session listings.
+        
+        Args:
+            data: Session data as saved to (or loaded from) JSON
+            
+        Returns:
+            Session summary dictionary
+        """
+        metadata = data.get('metadata', {})
+        return {
+            'id': data['id'],
+            'started_at': data['started_at'],
+            'last_updated': data['last_updated'],
+            'status': data['status'],
+            'state': data['state'],
+            'question_count': metadata.get('question_count', 0),
+            'message_count': metadata.get('message_count', 0),
+            'provider': data.get('provider'),
+            'model_id': data.get('model_id')
+        }
+    
+    def _read_session_summary(self, filepath: Path) -> Dict:
+        """
+        Read a session's summary, parsing only its header line when present.
+        
+        Falls back to parsing the whole file for sessions saved without a
+        header (or with one longer than the prefix read). Blocking; callers
+        run it in a worker thread.
+        
+        Args:
+            filepath: Path to the session JSON file
+            
+        Returns:
+            Session summary dictionary
+        """
+        with open(filepath, 'rb') as f:
+            prefix = f.read(_HEADER_READ_BYTES)
+            if prefix.startswith(_HEADER_PREFIX):
+                end = prefix.find(b'\n')
+                if end != -1:
+                    # Header line ends with the comma separating it from the body
+                    return orjson.loads(prefix[len(_HEADER_PREFIX):end - 1])
+            data = orjson.loads(prefix + f.read())
+        
+        return self._session_summary(data)
+    
     async def delete_session(self, session_id: str) -> bool:
         """
         Delete a session file.
         
-        Permanently removes the session JSON file from storage.
+        Permanently removes the session JSON file and its message log.
         
         Args:
             session_id: Unique session identifier
@@ -315,8 +722,13 @@ class SessionService:
                 )
                 return False
             
-            # Delete the file
+            # Delete the header and message log
+            self._meta_cache.pop(session_id, None)
+            self._last_hash.pop(session_id, None)
+            self._logged.pop(session_id, None)
+            self._log_records.pop(session_id, None)
             filepath.unlink()
+            self._log_path(session_id).unlink(missing_ok=True)
             
             logger.info(
                 "session_deleted",
@@ -380,7 +792,9 @@ class SessionService:
             Count of session JSON files
         """
         try:
-            count = len(list(self.base_dir.glob("*.json")))
+            # Count directory entries by name; no Path object or stat per file
+            with os.scandir(self.base_dir) as entries:
+                count = sum(1 for e in entries if e.name.endswith(".json"))
             logger.info("session_count_retrieved", count=count)
             return count
         except Exception as e:
@@ -7,36 +7,68 @@ separated by "-----" delimiters.
 """
 
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 import asyncio
-import aiofiles
 import structlog
 
 logger = structlog.get_logger()
 
+# Every saved interaction ends with this delimiter line
+_CHUNK_DELIMITER = "-----"
+
+
+def _append_text(filepath: Path, content: str) -> None:
+    """Append text to a file, creating it if needed (blocking)."""
+    with open(filepath, 'a', encoding='utf-8') as f:
+        f.write(content)
+
 
 class ConversationStorage:
     """
     Manages conversation storage in markdown format.
     
     Features:
-    - Async file operations for better performance
+    - Async file operations (one worker-thread hop per read or write)
+    - Buffered appends, written in batches per session (a crash loses
+      up to flush_interval - 1 unflushed interactions per session)
     - Thread-safe operations with file locking
     - Markdown formatting with metadata
     - Chunk-based storage with delimiters
     """
     
-    def __init__(self, base_dir: str = "./data/conversations"):
+    def __init__(
+        self,
+        base_dir: str = "./data/conversations",
+        flush_interval: int = 5,
+        max_buffer_bytes: int = 64 * 1024
+    ):
         """
         Initialize conversation storage.
         
+        Interactions are buffered in memory and appended to the session's
+        file once `flush_interval` of them (or `max_buffer_bytes` of text)
+        have accumulated, on any read of the session, or on flush().
+        Buffered interactions live only in memory: if the process dies
+        before they are written, up to `flush_interval - 1` interactions
+        per session are lost. Call flush() where that matters (e.g. on
+        shutdown), or pass flush_interval=1 to write every interaction.
+        
         Args:
             base_dir: Base directory for conversation files
+            flush_interval: Buffered interactions per session before a write
+            max_buffer_bytes: Buffered characters per session before a write
         """
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_buffer_bytes = max_buffer_bytes
+        self._buffers: Dict[str, List[str]] = {}
+        self._buffer_bytes: Dict[str, int] = {}
+        self._flush_locks: Dict[str, asyncio.Lock] = {}
+        self._flush_lock_users: Dict[str, int] = {}
         logger.info("conversation_storage_initialized", base_dir=str(self.base_dir))
     
     async def save_interaction(
@@ -49,6 +81,9 @@ class ConversationStorage:
         """
         Save a Q&A interaction to the session's markdown file.
         
+        The interaction is buffered and written with the session's next
+        batch (see flush()); until then it is lost if the process dies.
+        
         Args:
             session_id: Unique session identifier
             question: The question text
@@ -72,10 +107,14 @@ class ConversationStorage:
 
 """
         
+        buffer = self._buffers.setdefault(session_id, [])
+        buffer.append(content)
+        buffered_bytes = self._buffer_bytes.get(session_id, 0) + len(content)
+        self._buffer_bytes[session_id] = buffered_bytes
+        
         try:
-            # Append to file (create if doesn't exist)
-            async with aiofiles.open(filepath, 'a', encoding='utf-8') as f:
-                await f.write(content)
+            if len(buffer) >= self.flush_interval or buffered_bytes >= self.max_buffer_bytes:
+                await self.flush(session_id)
             
             logger.info(
                 "interaction_saved",
@@ -91,6 +130,68 @@ class ConversationStorage:
             )
             raise
     
+    @asynccontextmanager
+    async def _session_lock(self, session_id: str) -> AsyncIterator[None]:
+        """
+        Hold the per-session lock that orders writes and deletes.
+        
+        Locks are reference-counted and dropped once no task holds or
+        waits on them, so the table only grows with in-flight sessions.
+        
+        Args:
+            session_id: Session whose file is being written or deleted
+        """
+        lock = self._flush_locks.setdefault(session_id, asyncio.Lock())
+        self._flush_lock_users[session_id] = self._flush_lock_users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            users = self._flush_lock_users[session_id] - 1
+            if users:
+                self._flush_lock_users[session_id] = users
+            else:
+                del self._flush_lock_users[session_id]
+                del self._flush_locks[session_id]
+    
+    async def flush(self, session_id: Optional[str] = None) -> None:
+        """
+        Append buffered interactions to their markdown files.
+        
+        Args:
+            session_id: Session to flush; None flushes every session
+        """
+        session_ids = [session_id] if session_id is not None else list(self._buffers)
+        
+        for sid in session_ids:
+            # Serialize flushes per session so batches land in order
+            async with self._session_lock(sid):
+                buffer = self._buffers.pop(sid, None)
+                self._buffer_bytes.pop(sid, None)
+                if not buffer:
+                    continue
+                
+                filepath = self.base_dir / f"{sid}.md"
+                try:
+                    # Append to file (create if doesn't exist)
+                    await asyncio.to_thread(_append_text, filepath, "".join(buffer))
+                except Exception as e:
+                    # Put the batch back ahead of anything buffered meanwhile
+                    self._buffers[sid] = buffer + self._buffers.get(sid, [])
+                    self._buffer_bytes[sid] = sum(len(c) for c in self._buffers[sid])
+                    logger.error(
+                        "flush_interactions_failed",
+                        session_id=sid,
+                        error=str(e)
+                    )
+                    raise
+                
+                logger.info(
+                    "interactions_flushed",
+                    session_id=sid,
+                    interaction_count=len(buffer)
+                )
+    
     async def load_conversation(self, session_id: str) -> str:
         """
         Load the full conversation history for a session.
@@ -103,13 +204,14 @@ class ConversationStorage:
         """
         filepath = self.base_dir / f"{session_id}.md"
         
+        await self.flush(session_id)
+        
         if not filepath.exists():
             logger.warning("conversation_not_found", session_id=session_id)
             return ""
         
         try:
-            async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
-                content = await f.read()
+            content = await asyncio.to_thread(filepath.read_text, encoding='utf-8')
             
             logger.info(
                 "conversation_loaded",
@@ -138,19 +240,34 @@ class ConversationStorage:
         if not content:
             return []
         
-        # Split by delimiter
-        chunks = content.split("-----")
-        
-        # Clean and filter empty chunks
-        cleaned_chunks = []
-        for chunk in chunks:
-            chunk = chunk.strip()
-            if chunk:
-                cleaned_chunks.append(chunk)
+        cleaned_chunks = list(self.iter_chunks(content))
         
         logger.info("chunks_parsed", chunk_count=len(cleaned_chunks))
         return cleaned_chunks
     
+    def iter_chunks(self, content: str) -> Iterator[str]:
+        """
+        Yield non-empty conversation chunks one at a time.
+        
+        Scans for delimiters instead of splitting, so no intermediate list
+        of every segment (including empty ones) is built.
+        
+        Args:
+            content: Full markdown content
+            
+        Yields:
+            Stripped conversation chunks (Q&A pairs)
+        """
+        start = 0
+        while start < len(content):
+            end = content.find(_CHUNK_DELIMITER, start)
+            if end == -1:
+                end = len(content)
+            chunk = content[start:end].strip()
+            if chunk:
+                yield chunk
+            start = end + len(_CHUNK_DELIMITER)
+    
     async def get_interaction_count(self, session_id: str) -> int:
         """
         Get the number of interactions in a session.
@@ -162,33 +279,41 @@ class ConversationStorage:
             Number of Q&A interactions
         """
         content = await self.load_conversation(session_id)
-        chunks = self.parse_chunks(content)
-        return len(chunks)
+        # One delimiter per saved interaction; no need to build the chunks
+        return content.count(_CHUNK_DELIMITER)
     
     async def delete_conversation(self, session_id: str) -> bool:
         """
         Delete a conversation file.
         
+        Unwritten buffered interactions are discarded as well, but only a
+        removed file counts as a deletion.
+        
         Args:
             session_id: Unique session identifier
             
         Returns:
-            True if deleted, False if file didn't exist
+            True if the file was deleted, False if it didn't exist
         """
         filepath = self.base_dir / f"{session_id}.md"
         
-        if filepath.exists():
-            try:
-                filepath.unlink()
-                logger.info("conversation_deleted", session_id=session_id)
-                return True
-            except Exception as e:
-                logger.error(
-                    "delete_conversation_failed",
-                    session_id=session_id,
-                    error=str(e)
-                )
-                raise
+        # Wait for an in-flight flush so it can't recreate the file
+        async with self._session_lock(session_id):
+            self._buffers.pop(session_id, None)
+            self._buffer_bytes.pop(session_id, None)
+            
+            if filepath.exists():
+                try:
+                    filepath.unlink()
+                    logger.info("conversation_deleted", session_id=session_id)
+                    return True
+                except Exception as e:
+                    logger.error(
+                        "delete_conversation_failed",
+                        session_id=session_id,
+                        error=str(e)
+                    )
+                    raise
         
         logger.warning("conversation_not_found_for_deletion", session_id=session_id)
         return False
@@ -202,11 +327,17 @@ class ConversationStorage:
         """
         conversations = []
         
-        for filepath in self.base_dir.glob("*.md"):
+        await self.flush()
+        
+        # scandir yields names without a stat per glob match; stat once below
+        with os.scandir(self.base_dir) as entries:
+            md_entries = [e for e in entries if e.name.endswith(".md")]
+
+        for entry in md_entries:
             try:
-                stat = filepath.stat()
+                stat = entry.stat(follow_symlinks=False)
                 conversations.append({
-                    'session_id': filepath.stem,
+                    'session_id': entry.name[:-len(".md")],
                     'created_at': datetime.fromtimestamp(stat.st_ctime).isoformat(),
                     'modified_at': datetime.fromtimestamp(stat.st_mtime).isoformat(),
                     'size_bytes': stat.st_size
@@ -214,7 +345,7 @@ class ConversationStorage:
             except Exception as e:
                 logger.error(
                     "list_conversations_error",
-                    filepath=str(filepath),
+                    filepath=entry.path,
                     error=str(e)
                 )
         
@@ -4,10 +4,13 @@ Integration test for complete conversation flow with Groq API.
 Tests the full user journey: token setup → start chat → conversation → completion
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Load environment variables
 from dotenv import load_dotenv
 
@@ -28,19 +31,58 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from services.config_service import ConfigService
 from services.llm_service import LLMService
+from services.model_checker import ModelChecker
 from services.rag_service import RAGService
 from services.question_generator import QuestionGenerator
 from services.session_service import SessionService
 from services.conversation_service import ConversationService
+from storage.conversation_storage import ConversationStorage
+
+
+def _build_services() -> dict:
+    """
+    Build the service bundle shared by every test.
+    
+    RAGService loads an embedding model, which takes seconds, so the
+    services are built once and reused instead of per test.
+    """
+    config = ConfigService()
+    llm_service = LLMService(config, ModelChecker(config))
+    rag_service = RAGService(ConversationStorage())
+    question_generator = QuestionGenerator(llm_service)
+    session_service = SessionService()
+    
+    conversation = ConversationService(
+        llm_service=llm_service,
+        rag_service=rag_service,
+        question_generator=question_generator,
+        session_service=session_service
+    )
+    
+    return {
+        "config": config,
+        "llm_service": llm_service,
+        "rag_service": rag_service,
+        "question_generator": question_generator,
+        "session_service": session_service,
+        "conversation": conversation,
+    }
+
 
-def test_config_service():
+@pytest.fixture(scope="session")
+def services():
+    """Services shared across the whole test run"""
+    return _build_services()
+
+
+def test_config_service(services):
     """Test ConfigService for token management"""
     print("\n" + "="*60)
     print("📋 Test 1: Configuration Service")
     print("="*60)
     
     try:
-        config = ConfigService()
+        config = services["config"]
         
         # Get API key from environment
         groq_key = os.getenv("GROQ_API_KEY")
@@ -84,34 +126,20 @@ def test_config_service():
         traceback.print_exc()
         return False
 
-def test_conversation_flow():
+async def test_conversation_flow(services):
     """Test full conversation flow with real LLM"""
     print("\n" + "="*60)
     print("📋 Test 2: Conversation Flow with Real LLM")
     print("="*60)
     
     try:
-        # Initialize services
-        print("\n🔧 Initializing services...")
-        config = ConfigService()
-        llm_service = LLMService(config)
-        rag_service = RAGService()
-        question_generator = QuestionGenerator(llm_service, rag_service)
-        session_service = SessionService()
-        
-        conversation = ConversationService(
-            llm_service=llm_service,
-            rag_service=rag_service,
-            question_generator=question_generator,
-            session_service=session_service
-        )
-        print("   ✅ All services initialized")
+        conversation = services["conversation"]
         
         # Start investigation
         print("\n🚀 Starting investigation...")
         session_id, initial_question = conversation.start_investigation()
         print(f"   Session ID: {session_id}")
-        print(f"   Initial Question: {initial_question['text'][:100]}...")
+        print(f"   Initial Question: {initial_question.text[:100]}...")
         
         # Simulate answering questions
         answers = [
@@ -126,13 +154,13 @@ def test_conversation_flow():
             print(f"\n   Question {i}: Answering...")
             print(f"   Answer: {answer[:80]}...")
             
-            next_question = conversation.process_answer(session_id, answer)
+            next_question = await conversation.process_answer(session_id, answer)
             
             if next_question is None:
                 print(f"   ✅ Investigation complete after {i} answers")
                 break
             else:
-                print(f"   ✅ Next question: {next_question['text'][:80]}...")
+                print(f"   ✅ Next question: {next_question.text[:80]}...")
         
         # Get conversation history
         print("\n📜 Retrieving conversation history...")
@@ -151,25 +179,14 @@ def test_conversation_flow():
         traceback.print_exc()
         return False
 
-def test_session_persistence():
+async def test_session_persistence(services):
     """Test session persistence and retrieval"""
     print("\n" + "="*60)
     print("📋 Test 3: Session Persistence")
     print("="*60)
     
     try:
-        config = ConfigService()
-        llm_service = LLMService(config)
-        rag_service = RAGService()
-        question_generator = QuestionGenerator(llm_service, rag_service)
-        session_service = SessionService()
-        
-        conversation = ConversationService(
-            llm_service=llm_service,
-            rag_service=rag_service,
-            question_generator=question_generator,
-            session_service=session_service
-        )
+        conversation = services["conversation"]
         
         # Start a session
         print("\n🚀 Creating test session...")
@@ -178,8 +195,8 @@ def test_session_persistence():
         
         # Add some answers
         print("\n💬 Adding test answers...")
-        conversation.process_answer(session_id, "A productivity app")
-        conversation.process_answer(session_id, "Students and professionals")
+        await conversation.process_answer(session_id, "A productivity app")
+        await conversation.process_answer(session_id, "Students and professionals")
         
         # Retrieve session
         print("\n🔍 Retrieving session...")
@@ -199,17 +216,28 @@ def test_session_persistence():
         traceback.print_exc()
         return False
 
+async def run_all(services):
+    """Run every test against one service bundle"""
+    # Sequential, so output stays readable and the tests don't share
+    # in-flight state on the bundle's services
+    return [
+        ("Config Service", test_config_service(services)),
+        ("Conversation Flow", await test_conversation_flow(services)),
+        ("Session Persistence", await test_session_persistence(services))
+    ]
+
+
 if __name__ == "__main__":
     print("="*60)
     print("🧪 FULL CONVERSATION FLOW INTEGRATION TEST")
     print("="*60)
     
-    results = []
-    
     # Run tests
-    results.append(("Config Service", test_config_service()))
-    results.append(("Conversation Flow", test_conversation_flow()))
-    results.append(("Session Persistence", test_session_persistence()))
+    print("\n🔧 Initializing services...")
+    services_bundle = _build_services()
+    print("   ✅ All services initialized")
+    
+    results = asyncio.run(run_all(services_bundle))
     
     # Summary
     print("\n" + "="*60)
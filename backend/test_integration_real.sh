@@ -35,12 +35,14 @@ echo ""
 # Ensure we are in the backend directory
 cd "$(dirname "$0")"
 
-# Run tests with integration marker
+# Run tests with integration marker, one xdist worker per provider
 # We need to make sure we are in the backend directory or python path is set correctly
 export PYTHONPATH=$PYTHONPATH:.
 
 python3 -m pytest tests/integration/test_real_llm_integration.py \
     -m integration \
+    -n 2 \
+    --dist=loadgroup \
     -v \
     --tb=short \
     --maxfail=1
@@ -10,6 +10,7 @@ Note: WeasyPrint requires system libraries (libgobject, pango) which may not
 be available on all development machines. We mock it globally for tests.
 """
 
+import asyncio
 import pytest
 from unittest.mock import MagicMock
 import sys
@@ -23,14 +24,42 @@ sys.modules['weasyprint'] = MagicMock()
 from fastapi.testclient import TestClient
 from app import app
 
-# Load test environment variables
-load_dotenv(".env.test")
+# Load test environment variables once per process tree; xdist workers
+# inherit the marker (and the loaded values) from the controller
+if not os.environ.get("_ENV_TEST_LOADED"):
+    load_dotenv(".env.test")
+    os.environ["_ENV_TEST_LOADED"] = "1"
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """
+    One event loop for the whole session (asyncio_mode = auto in pytest.ini).
+    
+    Uses uvloop where it is installed (it isn't available on Windows), and
+    lets session-scoped async fixtures outlive a single test.
+    """
+    try:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """FastAPI test client; app startup/shutdown run once for the whole session."""
+    with TestClient(app) as c:
+        yield c
 
 
-@pytest.fixture
-def client():
-    """FastAPI test client."""
-    return TestClient(app)
+@pytest.fixture(autouse=True)
+def reset_dependency_overrides():
+    """Drop per-test dependency overrides on the shared app."""
+    yield
+    app.dependency_overrides.clear()
 
 
 @pytest.fixture
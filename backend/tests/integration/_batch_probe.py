@@ -0,0 +1,60 @@
+"""
+Batch several short probe prompts into one chat completion.
+
+On short prompts the time to first token dominates, so the integration
+tests ask all their sanity questions in one request and split the
+numbered answers back out.
+"""
+
+import re
+from typing import Dict, List
+
+_PROBE_SYSTEM_PROMPT = (
+    "Answer each numbered question on its own line, prefixed with its number, "
+    "like '1) answer'. Keep every answer to a few words."
+)
+
+# "1) four", "2. six", "3: ..." -> (number, answer)
+_ANSWER_LINE_RE = re.compile(r"^\s*(\d+)\s*[).:-]\s*(.*?)\s*$")
+
+
+def build_probe_message(prompts: List[str]) -> str:
+    """Number the prompts into a single user message."""
+    return "\n".join(f"{i}) {prompt}" for i, prompt in enumerate(prompts, 1))
+
+
+def parse_probe_response(response: str, count: int) -> List[str]:
+    """
+    Split a numbered response into one answer per prompt.
+
+    Args:
+        response: Model output with one numbered answer per line
+        count: Number of prompts that were asked
+
+    Returns:
+        Answers aligned with the prompts; "" where one is missing
+    """
+    answers: Dict[int, str] = {}
+    for line in response.splitlines():
+        match = _ANSWER_LINE_RE.match(line)
+        if match:
+            answers.setdefault(int(match.group(1)), match.group(2))
+    return [answers.get(i, "") for i in range(1, count + 1)]
+
+
+async def run_probe(llm_service, prompts: List[str]) -> List[str]:
+    """
+    Ask several prompts in one round-trip.
+
+    Args:
+        llm_service: LLMService with an initialized provider
+        prompts: Short, independent questions
+
+    Returns:
+        One answer per prompt, in order
+    """
+    response = await llm_service.generate_response(
+        system_prompt=_PROBE_SYSTEM_PROMPT,
+        user_message=build_probe_message(prompts)
+    )
+    return parse_probe_response(response, len(prompts))
@@ -0,0 +1,44 @@
+"""
+Pooled HTTP clients shared by the real-API integration tests.
+
+Each provider gets one keep-alive httpx pool for the whole session, handed
+to LangChain through LLMService.initialize_provider(http_async_client=...),
+instead of every LLMService's SDK client building its own. Import the
+fixtures into a test module to use them.
+"""
+
+import os
+
+import httpx
+import pytest
+
+# Provider keys, resolved once; conftest.py has loaded .env.test by now, and
+# ConfigService.save_token later rewrites these variables in os.environ
+GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+
+# Connection pool shared by every request a provider client makes
+_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=10,
+    max_connections=10,
+    keepalive_expiry=30
+)
+
+
+def _pooled_http_client() -> httpx.AsyncClient:
+    """Build a keep-alive HTTP client for one provider."""
+    return httpx.AsyncClient(timeout=60.0, limits=_POOL_LIMITS)
+
+
+@pytest.fixture(scope="session")
+async def groq_http_client():
+    """HTTP pool shared by every Groq integration test."""
+    async with _pooled_http_client() as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+async def openai_http_client():
+    """HTTP pool shared by every OpenAI integration test."""
+    async with _pooled_http_client() as client:
+        yield client
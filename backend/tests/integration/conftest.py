@@ -0,0 +1,22 @@
+"""
+Fixtures shared by the real-API integration tests.
+"""
+
+import pytest
+
+from services.config_service import ConfigService, InMemoryEnvBackend
+from services.model_checker import ModelChecker
+
+
+@pytest.fixture(scope="session")
+def model_checker():
+    """
+    One ModelChecker for the whole integration run.
+    
+    Its per-provider model cache means each provider's /models endpoint is
+    fetched at most once per session; the cache is dropped at teardown.
+    Tests pass their API key explicitly, so the in-memory config is empty.
+    """
+    checker = ModelChecker(ConfigService(backend=InMemoryEnvBackend()))
+    yield checker
+    checker.invalidate_cache()
@@ -10,7 +10,7 @@ Tests cover:
 """
 
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import Mock, AsyncMock
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 
@@ -20,90 +20,102 @@ from models.conversation import Message, Question, MessageRole, ConversationStat
 from datetime import datetime
 
 
-@pytest.fixture
-def mock_conversation_service():
-    """Create mock ConversationService"""
-    mock = Mock(spec=ConversationService)
-    
-    # Mock start_investigation
-    mock_question = Question(
-        id="q-123",
-        category="functionality",
-        text="What is the main functionality of your product?",
-        context=[],
-        is_followup=False,
-        timestamp=datetime.utcnow()
-    )
-    mock.start_investigation.return_value = ("session-123", mock_question)
-    
-    # Mock process_answer
-    next_question = Question(
-        id="q-456",
-        category="users",
-        text="Who are your target users?",
-        context=[],
-        is_followup=False,
-        timestamp=datetime.utcnow()
-    )
-    mock.process_answer = AsyncMock(return_value=next_question)
-    
-    # Mock get_conversation_history
-    mock_messages = [
-        Message(
-            id="m-1",
-            session_id="session-123",
-            role=MessageRole.SYSTEM,
-            content="What is your product?",
-            timestamp=datetime.utcnow(),
-            metadata={}
-        ),
-        Message(
-            id="m-2",
-            session_id="session-123",
-            role=MessageRole.USER,
-            content="A task management app",
-            timestamp=datetime.utcnow(),
-            metadata={}
-        )
-    ]
-    mock.get_conversation_history.return_value = mock_messages
-    
-    # Mock get_session
-    mock_session = Session(
-        id="session-123",
-        started_at=datetime.utcnow(),
-        last_updated=datetime.utcnow(),
-        status="active",
-        state=ConversationState.FUNCTIONALITY,
-        investigation_progress={},
+# Fixed payloads, built once for the module
+_FIXED_TIME = datetime(2024, 1, 1)
+
+_START_QUESTION = Question(
+    id="q-123",
+    category="functionality",
+    text="What is the main functionality of your product?",
+    context=[],
+    is_followup=False,
+    timestamp=_FIXED_TIME
+)
+
+_NEXT_QUESTION = Question(
+    id="q-456",
+    category="users",
+    text="Who are your target users?",
+    context=[],
+    is_followup=False,
+    timestamp=_FIXED_TIME
+)
+
+_HISTORY = [
+    Message(
+        id="m-1",
+        session_id="session-123",
+        role=MessageRole.SYSTEM,
+        content="What is your product?",
+        timestamp=_FIXED_TIME,
+        metadata={}
+    ),
+    Message(
+        id="m-2",
+        session_id="session-123",
+        role=MessageRole.USER,
+        content="A task management app",
+        timestamp=_FIXED_TIME,
         metadata={}
     )
-    mock.get_session.return_value = mock_session
-    
-    # Mock is_investigation_complete
+]
+
+_SESSION = Session(
+    id="session-123",
+    started_at=_FIXED_TIME,
+    last_updated=_FIXED_TIME,
+    status="active",
+    state=ConversationState.FUNCTIONALITY,
+    investigation_progress={},
+    metadata={}
+)
+
+
+def _configure_defaults(mock):
+    """Install the default behavior every test starts from"""
+    mock.start_investigation.return_value = ("session-123", _START_QUESTION)
+    mock.process_answer = AsyncMock(return_value=_NEXT_QUESTION)
+    mock.get_conversation_history.return_value = _HISTORY
+    mock.get_session.return_value = _SESSION
     mock.is_investigation_complete.return_value = False
-    
-    return mock
 
 
-@pytest.fixture
-def app(mock_conversation_service):
-    """Create FastAPI test app with mocked dependencies"""
-    from routes.chat_routes import get_conversation_service
-    
+@pytest.fixture(scope="module")
+def mock_conversation_service():
+    """Create mock ConversationService once for the module"""
+    return Mock(spec=ConversationService)
+
+
+@pytest.fixture(autouse=True)
+def reset_conversation_service(mock_conversation_service):
+    """Clear recorded calls and per-test overrides before each test"""
+    mock_conversation_service.reset_mock(return_value=True, side_effect=True)
+    _configure_defaults(mock_conversation_service)
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Create FastAPI test app, shared by every test in the module"""
     app = FastAPI()
     app.include_router(router)
-    
-    # Override dependency to return mock
-    app.dependency_overrides[get_conversation_service] = lambda: mock_conversation_service
-    
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client(app):
-    """Create test client"""
-    return TestClient(app)
+    """Create test client once for the module, reusing one event loop thread"""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def override_conversation_service(app, mock_conversation_service):
+    """Point the app at this test's mock, then drop the override"""
+    from routes.chat_routes import get_conversation_service
+    
+    app.dependency_overrides[get_conversation_service] = lambda: mock_conversation_service
+    yield
+    app.dependency_overrides.clear()
 
 
 class TestStartInvestigation:
@@ -154,7 +166,6 @@ class TestStartInvestigation:
 class TestSendMessage:
     """Test suite for POST /api/chat/message endpoint"""
     
-    @pytest.mark.asyncio
     async def test_send_message_success(self, client, mock_conversation_service):
         """Test successful message sending"""
         response = client.post("/api/chat/message", json={
@@ -176,7 +187,6 @@ class TestSendMessage:
             answer_text="A task management app for remote teams"
         )
     
-    @pytest.mark.asyncio
     async def test_send_message_investigation_complete(self, client, mock_conversation_service):
         """Test message when investigation is complete"""
         mock_conversation_service.process_answer = AsyncMock(return_value=None)
@@ -193,7 +203,6 @@ class TestSendMessage:
         assert data["complete"] is True
         assert "complete" in data["message"].lower()
     
-    @pytest.mark.asyncio
     async def test_send_message_session_not_found(self, client, mock_conversation_service):
         """Test error when session not found"""
         mock_conversation_service.process_answer = AsyncMock(
@@ -305,69 +314,63 @@ class TestWebSocket:
     
     def test_websocket_connection(self, client, mock_conversation_service):
         """Test WebSocket connection"""
-        # Patch get_conversation_service at module level for WebSocket
-        with patch('routes.chat_routes.get_conversation_service', return_value=mock_conversation_service):
-            with client.websocket_connect("/api/chat/ws/session-123") as websocket:
-                # Receive welcome message
-                data = websocket.receive_json()
-                assert data["type"] == "connected"
-                assert data["session_id"] == "session-123"
+        with client.websocket_connect("/api/chat/ws/session-123") as websocket:
+            # Receive welcome message
+            data = websocket.receive_json()
+            assert data["type"] == "connected"
+            assert data["session_id"] == "session-123"
     
     def test_websocket_send_message(self, client, mock_conversation_service):
         """Test sending message via WebSocket"""
-        with patch('routes.chat_routes.get_conversation_service', return_value=mock_conversation_service):
-            with client.websocket_connect("/api/chat/ws/session-123") as websocket:
-                # Skip welcome message
-                websocket.receive_json()
-                
-                # Send message
-                websocket.send_json({"message": "Test message"})
-                
-                # Receive response
-                data = websocket.receive_json()
-                assert data["type"] == "question"
-                assert "question" in data
+        with client.websocket_connect("/api/chat/ws/session-123") as websocket:
+            # Skip welcome message
+            websocket.receive_json()
+            
+            # Send message
+            websocket.send_json({"message": "Test message"})
+            
+            # Receive response
+            data = websocket.receive_json()
+            assert data["type"] == "question"
+            assert "question" in data
     
     def test_websocket_investigation_complete(self, client, mock_conversation_service):
         """Test WebSocket when investigation completes"""
         mock_conversation_service.process_answer = AsyncMock(return_value=None)
         
-        with patch('routes.chat_routes.get_conversation_service', return_value=mock_conversation_service):
-            with client.websocket_connect("/api/chat/ws/session-123") as websocket:
-                # Skip welcome message
-                websocket.receive_json()
-                
-                # Send message
-                websocket.send_json({"message": "Final answer"})
-                
-                # Receive completion
-                data = websocket.receive_json()
-                assert data["type"] == "complete"
+        with client.websocket_connect("/api/chat/ws/session-123") as websocket:
+            # Skip welcome message
+            websocket.receive_json()
+            
+            # Send message
+            websocket.send_json({"message": "Final answer"})
+            
+            # Receive completion
+            data = websocket.receive_json()
+            assert data["type"] == "complete"
     
     def test_websocket_session_not_found(self, client, mock_conversation_service):
         """Test WebSocket error when session not found"""
         mock_conversation_service.get_session.return_value = None
         
-        with patch('routes.chat_routes.get_conversation_service', return_value=mock_conversation_service):
-            with client.websocket_connect("/api/chat/ws/invalid-session") as websocket:
-                data = websocket.receive_json()
-                assert data["type"] == "error"
-                assert "Session not found" in data["message"]
+        with client.websocket_connect("/api/chat/ws/invalid-session") as websocket:
+            data = websocket.receive_json()
+            assert data["type"] == "error"
+            assert "Session not found" in data["message"]
     
     def test_websocket_missing_message_field(self, client, mock_conversation_service):
         """Test WebSocket error for invalid message format"""
-        with patch('routes.chat_routes.get_conversation_service', return_value=mock_conversation_service):
-            with client.websocket_connect("/api/chat/ws/session-123") as websocket:
-                # Skip welcome message
-                websocket.receive_json()
-                
-                # Send invalid data
-                websocket.send_json({"invalid": "data"})
-                
-                # Receive error
-                data = websocket.receive_json()
-                assert data["type"] == "error"
-                assert "Missing 'message' field" in data["message"]
+        with client.websocket_connect("/api/chat/ws/session-123") as websocket:
+            # Skip welcome message
+            websocket.receive_json()
+            
+            # Send invalid data
+            websocket.send_json({"invalid": "data"})
+            
+            # Receive error
+            data = websocket.receive_json()
+            assert data["type"] == "error"
+            assert "Missing 'message' field" in data["message"]
 
 
 class TestResponseModels:
@@ -6,6 +6,7 @@ Tests cover:
 - Token encryption/decryption
 - Provider switching
 - Configuration persistence
+- Settings backends (.env file and in-memory)
 - Error handling
 """
 
@@ -13,7 +14,7 @@ import pytest
 import os
 import tempfile
 from unittest.mock import patch, mock_open
-from services.config_service import ConfigService
+from services.config_service import ConfigService, DotenvBackend, InMemoryEnvBackend
 
 
 class TestConfigService:
@@ -90,6 +91,41 @@ class TestConfigService:
             # Encrypted token should not contain the original
             assert original_token not in content
     
+    def test_get_token_decrypts_once(self, config_service):
+        """Test decrypted tokens are reused until the stored value changes"""
+        token = "gsk_test_token_1234567890abcdefghijklmnop"
+        config_service.save_token("groq", token)
+        
+        with patch.object(config_service.cipher, 'decrypt', wraps=config_service.cipher.decrypt) as decrypt:
+            assert config_service.get_token("groq") == token
+            assert config_service.get_token("groq") == token
+            assert decrypt.call_count == 0
+            
+            # A value stored and loaded by another instance is decrypted again
+            other = config_service.cipher.encrypt(b"gsk_other_token_1234567890abcdef").decode()
+            config_service.backend.set("GROQ_API_KEY", other)
+            ConfigService(config_service.env_file)
+            assert config_service.get_token("groq") == "gsk_other_token_1234567890abcdef"
+            assert config_service.get_token("groq") == "gsk_other_token_1234567890abcdef"
+            assert decrypt.call_count == 1
+    
+    def test_cipher_shared_between_instances(self, config_service):
+        """Test instances using the same key reuse one Fernet cipher"""
+        other_service = ConfigService(config_service.env_file)
+        
+        assert other_service.encryption_key == config_service.encryption_key
+        assert other_service.cipher is config_service.cipher
+    
+    def test_env_snapshot_shared_between_instances(self, config_service):
+        """Test settings saved through one instance are read by another"""
+        other_service = ConfigService(config_service.env_file)
+        other_service.save_token("openai", "sk-test-openai-1234567890abcdefghijklmnop")
+        other_service.save_selected_model("openai", "gpt-4o-mini")
+        
+        assert config_service.get_active_provider() == "openai"
+        assert config_service.get_selected_model() == "gpt-4o-mini"
+        assert config_service.get_token("openai") == "sk-test-openai-1234567890abcdefghijklmnop"
+    
     def test_switch_provider(self, config_service):
         """Test provider switching logic"""
         # Save tokens for both providers
@@ -271,3 +307,50 @@ class TestConfigServiceIntegration:
         new_service = ConfigService(str(env_file))
         retrieved = new_service.get_token("groq")
         assert retrieved == token
+    
+    def test_in_memory_backend(self, tmp_path, monkeypatch):
+        """Test settings round-trip through the in-memory backend without files or os.environ"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("GROQ_API_KEY", raising=False)
+        monkeypatch.delenv("GROQ_SELECTED_MODEL", raising=False)
+        backend = InMemoryEnvBackend()
+        service = ConfigService(str(tmp_path / ".env"), backend=backend)
+        token = "gsk_" + "m" * 40
+        
+        assert service.save_token("groq", token) is True
+        assert service.save_selected_model("groq", "llama-3.3-70b-versatile") is True
+        
+        assert service.get_token("groq") == token
+        assert service.get_selected_model("groq") == "llama-3.3-70b-versatile"
+        assert backend.values["ACTIVE_PROVIDER"] == "groq"
+        assert "GROQ_API_KEY" not in os.environ
+        assert "GROQ_SELECTED_MODEL" not in os.environ
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_dotenv_backend_set_many(self, tmp_path):
+        """Test several settings are written to the .env file in one rewrite"""
+        env_file = tmp_path / ".env"
+        env_file.write_text("# comment\nACTIVE_PROVIDER='openai'\nOTHER=1")
+        
+        DotenvBackend(str(env_file)).set_many({
+            "ACTIVE_PROVIDER": "groq",
+            "GROQ_API_KEY": "it's-encrypted"
+        })
+        
+        assert env_file.read_text() == (
+            "# comment\n"
+            "ACTIVE_PROVIDER='groq'\n"
+            "OTHER=1\n"
+            "GROQ_API_KEY='it\\'s-encrypted'\n"
+        )
+        assert list(tmp_path.iterdir()) == [env_file]
+    
+    def test_dotenv_backend_keeps_file_private(self, tmp_path):
+        """Test rewriting the .env file never widens its permissions"""
+        env_file = tmp_path / ".env"
+        env_file.write_text("ACTIVE_PROVIDER='openai'\n")
+        env_file.chmod(0o600)
+        
+        DotenvBackend(str(env_file)).set("GROQ_API_KEY", "encrypted")
+        
+        assert env_file.stat().st_mode & 0o777 == 0o600
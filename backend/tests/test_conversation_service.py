@@ -127,6 +127,12 @@ class TestStartInvestigation:
         assert messages[0].role == MessageRole.SYSTEM
         assert messages[0].content == question.text
         assert messages[0].metadata["question_id"] == question.id
+    
+    def test_start_investigation_counts_initial_question(self, conversation_service):
+        """Test that the session's question count includes the initial question"""
+        session_id, _ = conversation_service.start_investigation()
+        
+        assert conversation_service.sessions[session_id].question_count == 1
 
 
 class TestProcessAnswer:
@@ -334,6 +340,22 @@ class TestConversationHistory:
         with pytest.raises(ValueError, match="Session .* not found"):
             conversation_service.get_conversation_history("invalid-session-id")
     
+    def test_get_messages_by_role(self, conversation_service):
+        """Test per-role message lookup follows the history"""
+        session_id, _ = conversation_service.start_investigation()
+        conversation_service._add_message(session_id, MessageRole.USER, "First answer")
+        conversation_service._add_message(session_id, MessageRole.ASSISTANT, "Follow-up?")
+        conversation_service._add_message(session_id, MessageRole.USER, "Second answer")
+        
+        history = conversation_service.get_conversation_history(session_id)
+        for role in MessageRole:
+            assert conversation_service.get_messages_by_role(session_id, role) == [
+                m for m in history if m.role == role
+            ]
+        
+        conversation_service.forget_session(session_id)
+        assert conversation_service.get_messages_by_role(session_id, MessageRole.USER) == []
+    
     @pytest.mark.asyncio
     async def test_message_ordering(self, conversation_service):
         """Test that messages are in chronological order"""
@@ -392,6 +414,35 @@ class TestSessionManagement:
         assert len(conversation_service.messages[session_id_1]) == 1
         assert len(conversation_service.messages[session_id_2]) == 1
 
+    
+    def test_forget_session_drops_in_memory_state(self, conversation_service):
+        """Test that forgetting a session clears its state and prompt history"""
+        session_id, _ = conversation_service.start_investigation()
+        conversation_service.question_gen = Mock()
+        conversation_service.last_save_counts[session_id] = 1
+        
+        conversation_service.forget_session(session_id)
+        
+        assert conversation_service.get_session(session_id) is None
+        assert session_id not in conversation_service.messages
+        assert session_id not in conversation_service.last_save_counts
+        conversation_service.question_gen.forget_history.assert_called_once_with(session_id)
+    
+    @pytest.mark.asyncio
+    async def test_skip_updates_session_fields(self, conversation_service):
+        """Test state changes are stored and tracked like normal assignments"""
+        session_id, _ = conversation_service.start_investigation()
+        session = conversation_service.get_session(session_id)
+        before = session.last_updated
+        
+        await conversation_service.skip_current_question(session_id)
+        
+        assert session.state == ConversationState.FUNCTIONALITY
+        assert session.last_updated >= before
+        assert {"state", "last_updated"} <= session.model_fields_set
+        assert session.model_dump()["state"] == ConversationState.FUNCTIONALITY
+        assert Session.model_validate(session.model_dump()) == session
+
 
 class TestDependencyInjection:
     """Test suite for dependency injection"""
@@ -402,3 +453,22 @@ class TestDependencyInjection:
         
         assert isinstance(service, ConversationService)
         assert isinstance(service.llm, LLMService)
+    
+    def test_get_conversation_service_builds_once(self, monkeypatch, mock_llm_service):
+        """Test concurrent first calls share one singleton"""
+        import services.conversation_service as conversation_module
+        from concurrent.futures import ThreadPoolExecutor
+        
+        get_llm = Mock(return_value=mock_llm_service)
+        monkeypatch.setattr(conversation_module, "_conversation_service_instance", None)
+        monkeypatch.setattr("services.llm_service.get_llm_service", get_llm)
+        monkeypatch.setattr("services.rag_service.get_rag_service", Mock())
+        monkeypatch.setattr("services.question_generator.get_question_generator", Mock())
+        monkeypatch.setattr("storage.conversation_storage.ConversationStorage", Mock())
+        monkeypatch.setattr(conversation_module, "SessionService", Mock())
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            services = list(pool.map(lambda _: get_conversation_service(), range(16)))
+        
+        assert all(service is services[0] for service in services)
+        get_llm.assert_called_once()
@@ -39,6 +39,7 @@ class TestConversationStorage:
         answer = "A mobile app for tracking fitness goals"
         
         await storage.save_interaction(session_id, question, answer)
+        await storage.flush(session_id)
         
         # Verify file was created
         filepath = storage.get_filepath(session_id)
@@ -162,6 +163,20 @@ class TestConversationStorage:
         count = await storage.get_interaction_count(session_id)
         assert count == 5
     
+    @pytest.mark.asyncio
+    async def test_interactions_written_in_batches(self, storage):
+        """Test that interactions are buffered until the flush interval."""
+        session_id = "test-session-batch"
+        filepath = storage.get_filepath(session_id)
+        
+        for i in range(storage.flush_interval - 1):
+            await storage.save_interaction(session_id, f"Question {i}?", f"Answer {i}")
+        assert not filepath.exists()
+        
+        await storage.save_interaction(session_id, "Last question?", "Last answer")
+        assert filepath.exists()
+        assert filepath.read_text(encoding='utf-8').count("-----") == storage.flush_interval
+    
     @pytest.mark.asyncio
     async def test_delete_conversation(self, storage):
         """Test deleting a conversation file."""
@@ -169,6 +184,7 @@ class TestConversationStorage:
         
         # Create a conversation
         await storage.save_interaction(session_id, "Q?", "A")
+        await storage.flush(session_id)
         
         # Verify it exists
         filepath = storage.get_filepath(session_id)
@@ -183,6 +199,28 @@ class TestConversationStorage:
         result = await storage.delete_conversation(session_id)
         assert result is False
     
+    @pytest.mark.asyncio
+    async def test_delete_buffered_only_conversation(self, storage):
+        """Test that discarding unwritten interactions is not a deletion."""
+        session_id = "test-session-buffered"
+        
+        await storage.save_interaction(session_id, "Q?", "A")
+        
+        result = await storage.delete_conversation(session_id)
+        assert result is False
+        assert await storage.load_conversation(session_id) == ""
+    
+    @pytest.mark.asyncio
+    async def test_flush_locks_released(self, storage):
+        """Test that per-session locks are dropped once unused."""
+        for i in range(3):
+            await storage.save_interaction(f"test-session-lock-{i}", "Q?", "A")
+        await storage.flush()
+        await storage.delete_conversation("test-session-lock-0")
+        
+        assert storage._flush_locks == {}
+        assert storage._flush_lock_users == {}
+    
     @pytest.mark.asyncio
     async def test_list_conversations(self, storage):
         """Test listing all conversation files."""
@@ -305,6 +343,7 @@ class TestConversationStorageEdgeCases:
         # Valid session IDs should work
         session_id = "session-with-dashes-123"
         await storage.save_interaction(session_id, "Q?", "A")
+        await storage.flush(session_id)
         
         filepath = storage.get_filepath(session_id)
         assert filepath.exists()
@@ -4,11 +4,19 @@ Unit tests for Question Generator
 Tests question generation, templates, state progression, and LLM integration.
 """
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from datetime import datetime
 
-from services.question_generator import QuestionGenerator, get_question_generator
+import uuid
+
+from services.question_generator import (
+    QuestionGenerator,
+    get_question_generator,
+    _new_id,
+    _CATEGORY_SYSTEM_PREFIX
+)
 from services.llm_service import LLMService
 from models.conversation import Session, Message, Question, ConversationState, MessageRole
 
@@ -80,6 +88,33 @@ class TestQuestionGeneratorBasics:
         assert question.is_followup is False
         assert "problem" in question.text.lower() or "product" in question.text.lower()
     
+    def test_question_ids_are_time_ordered_uuids(self):
+        """Test that generated question IDs are unique, valid UUIDv7 strings."""
+        ids = [_new_id() for _ in range(200)]
+        
+        assert len(set(ids)) == len(ids)
+        for question_id in ids:
+            parsed = uuid.UUID(question_id)
+            assert str(parsed) == question_id
+            assert parsed.version == 7
+        # Millisecond timestamp prefix is non-decreasing
+        assert [i[:13] for i in ids] == sorted(i[:13] for i in ids)
+    
+    def test_questions_are_immutable(self, question_generator):
+        """Test that generated questions cannot be modified after creation."""
+        question = question_generator.get_initial_question()
+        
+        with pytest.raises(Exception):
+            question.text = "Changed"
+    
+    def test_question_timestamps_are_naive_utc(self, question_generator):
+        """Test that question timestamps are naive UTC like message timestamps."""
+        before = datetime.utcnow()
+        question = question_generator.get_initial_question()
+        
+        assert question.timestamp.tzinfo is None
+        assert before <= question.timestamp <= datetime.utcnow()
+    
     def test_singleton_access(self, mock_llm_service):
         """Test singleton access pattern."""
         # Reset singleton
@@ -91,6 +126,20 @@ class TestQuestionGeneratorBasics:
         
         assert qg1 is qg2
     
+    def test_singleton_concurrent_first_calls(self, mock_llm_service):
+        """Test that concurrent first calls share one instance."""
+        import services.question_generator as qg_module
+        from concurrent.futures import ThreadPoolExecutor
+        qg_module._question_generator_instance = None
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            instances = list(pool.map(
+                lambda _: get_question_generator(llm_service=mock_llm_service),
+                range(16)
+            ))
+        
+        assert all(instance is instances[0] for instance in instances)
+    
     def test_singleton_requires_llm_first_call(self):
         """Test that singleton requires LLM service on first call."""
         import services.question_generator as qg_module
@@ -137,7 +186,7 @@ class TestStateProgression:
             ConversationState.COMPLETE
         ]
         
-        assert question_generator.state_order == expected_states
+        assert list(question_generator.state_order) == expected_states
 
 
 class TestFollowUpDecision:
@@ -161,6 +210,15 @@ class TestFollowUpDecision:
         )
         assert needs_followup is True
     
+    def test_needs_followup_long_vague_answer(self, question_generator):
+        """Test that vague phrases trigger follow-up regardless of length or case."""
+        vague_answer = "Honestly I am NOT SURE yet who the users will be, it could be teams of any size"
+        needs_followup = question_generator._needs_followup(
+            vague_answer,
+            ConversationState.USERS
+        )
+        assert needs_followup is True
+    
     def test_no_followup_detailed_answer(self, question_generator):
         """Test that detailed answers don't trigger follow-up."""
         detailed_answer = "A comprehensive task management platform designed specifically for remote teams, featuring real-time collaboration, automated workflows, and integrated communication tools."
@@ -170,6 +228,20 @@ class TestFollowUpDecision:
         )
         assert needs_followup is False
     
+    def test_needs_followup_counts_words_across_any_whitespace(self, question_generator):
+        """Test that newlines, tabs and repeated spaces separate words normally."""
+        multiline_answer = "Teams\nplan\tsprints,  track tasks and\n\nshare files across time zones easily"
+        assert question_generator._needs_followup(
+            multiline_answer,
+            ConversationState.FUNCTIONALITY
+        ) is False
+        
+        padded_answer = "Yes  " + " " * 20 + "  really"
+        assert question_generator._needs_followup(
+            padded_answer,
+            ConversationState.FUNCTIONALITY
+        ) is True
+    
     def test_no_followup_in_review_state(self, question_generator):
         """Test that REVIEW state never triggers follow-up."""
         short_answer = "Yes"
@@ -438,6 +510,196 @@ class TestLLMIntegration:
         assert "Short answer" in user_prompt
         assert "functionality" in user_prompt.lower()
     
+    @pytest.mark.asyncio
+    async def test_llm_prompt_history_is_capped(
+        self,
+        question_generator,
+        sample_session,
+        mock_llm_service
+    ):
+        """Test that only recent, truncated history is sent to the LLM."""
+        sample_session.state = ConversationState.FUNCTIONALITY
+        messages = [
+            Message(
+                id=f"msg-{i}",
+                session_id="test-session-001",
+                role=MessageRole.ASSISTANT if i % 2 == 0 else MessageRole.USER,
+                content=f"message-{i} " + "x" * 1000
+            )
+            for i in range(12)
+        ]
+        
+        await question_generator._generate_followup(
+            sample_session,
+            "Short answer",
+            context=[],
+            messages=messages
+        )
+        
+        user_prompt = mock_llm_service.generate_response.call_args[0][1]
+        assert "message-3 " not in user_prompt
+        assert "message-4 " in user_prompt
+        assert "message-11 " in user_prompt
+        assert "x" * 301 not in user_prompt
+    
+    def test_recorded_history_matches_message_list(
+        self,
+        question_generator,
+        sample_messages
+    ):
+        """Test that the incremental history buffer mirrors the message list."""
+        for msg in sample_messages:
+            question_generator.record_message("test-session-001", msg.role, msg.content)
+        
+        buffered = question_generator._format_history(
+            sample_messages, limit=6, session_id="test-session-001"
+        )
+        rebuilt = question_generator._format_history(sample_messages, limit=6)
+        assert buffered == rebuilt
+        
+        # An edit invalidates the buffer so the next prompt sees the new text
+        sample_messages[-1].content = "Edited answer"
+        question_generator.forget_history("test-session-001")
+        buffered = question_generator._format_history(
+            sample_messages, limit=6, session_id="test-session-001"
+        )
+        assert buffered.endswith("A: Edited answer")
+    
+    def test_history_cache_evicts_least_recent_session(self, question_generator, monkeypatch):
+        """Test that history buffers are kept for a bounded number of sessions."""
+        import services.question_generator as question_module
+        monkeypatch.setattr(question_module, "_HISTORY_CACHE_SESSIONS", 2)
+        
+        question_generator.record_message("s-1", "assistant", "Q1?")
+        question_generator.record_message("s-2", "assistant", "Q2?")
+        question_generator.record_message("s-1", "user", "A1")
+        question_generator.record_message("s-3", "assistant", "Q3?")
+        
+        assert list(question_generator._history_cache) == ["s-1", "s-3"]
+        assert "s-2" not in question_generator._history_counts
+    
+    def test_history_role_accepts_enum_or_string(self, question_generator):
+        """Test that enum and plain-string roles format identically."""
+        question_generator.record_message("s-enum", MessageRole.ASSISTANT, "Hi?")
+        question_generator.record_message("s-str", "assistant", "Hi?")
+        
+        assert list(question_generator._history_cache["s-enum"]) == ["Q: Hi?"]
+        assert list(question_generator._history_cache["s-str"]) == ["Q: Hi?"]
+    
+    @pytest.mark.asyncio
+    async def test_category_system_prompt_has_stable_prefix(
+        self,
+        question_generator,
+        sample_session,
+        sample_messages,
+        mock_llm_service
+    ):
+        """Test that category prompts share a cacheable, category-free prefix."""
+        system_prompts = []
+        for state in (ConversationState.USERS, ConversationState.MARKET):
+            await question_generator._generate_category_question(
+                state,
+                [],
+                sample_session,
+                messages=sample_messages
+            )
+            system_prompts.append(
+                mock_llm_service.generate_response.call_args[0][0]
+            )
+        
+        for prompt in system_prompts:
+            assert prompt.startswith(_CATEGORY_SYSTEM_PREFIX)
+            assert prompt.count("Example topics for") == 1
+        assert "users" in system_prompts[0][len(_CATEGORY_SYSTEM_PREFIX):]
+        assert "market" in system_prompts[1][len(_CATEGORY_SYSTEM_PREFIX):]
+    
+    @pytest.mark.asyncio
+    async def test_category_question_cache_reuses_llm_text(
+        self,
+        question_generator,
+        sample_session,
+        sample_messages,
+        mock_llm_service
+    ):
+        """Test that an identical category prompt is served from the cache."""
+        first = await question_generator._generate_category_question(
+            ConversationState.DESIGN, [], sample_session, messages=sample_messages
+        )
+        second = await question_generator._generate_category_question(
+            ConversationState.DESIGN, [], sample_session, messages=sample_messages
+        )
+        
+        assert mock_llm_service.generate_response.call_count == 1
+        assert second.text == first.text
+        assert second.id != first.id
+        assert question_generator.cache_hits == 1
+        assert question_generator.cache_misses == 1
+    
+    @pytest.mark.asyncio
+    async def test_streamed_question_stops_at_question_mark(
+        self,
+        question_generator,
+        sample_session,
+        mock_llm_service
+    ):
+        """Test that streamed output is cut after the first complete question."""
+        deltas = [
+            "Since you mentioned remote teams, I'm curious ",
+            "how they would coordinate their daily work across time zones",
+            "? Also, ",
+            "what about pricing?"
+        ]
+        consumed = []
+        
+        async def fake_stream(*args, **kwargs):
+            for delta in deltas:
+                consumed.append(delta)
+                yield delta
+        
+        mock_llm_service.stream_response = fake_stream
+        sample_session.state = ConversationState.FUNCTIONALITY
+        
+        question = await question_generator._generate_followup(
+            sample_session, "Short answer", []
+        )
+        
+        assert question.text.endswith("across time zones?")
+        assert "pricing" not in question.text
+        assert len(consumed) == 3
+        mock_llm_service.generate_response.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_stalled_stream_reuses_partial_question(
+        self,
+        sample_session,
+        mock_llm_service
+    ):
+        """Test that a stream stalling after a complete question skips the fallback."""
+        question_generator = QuestionGenerator(
+            llm_service=mock_llm_service,
+            stream_timeout=0.05
+        )
+        closed = []
+        
+        async def stalling_stream(*args, **kwargs):
+            try:
+                yield "Who will use it? And "
+                await asyncio.sleep(10)
+                yield "never sent"
+            finally:
+                closed.append(True)
+        
+        mock_llm_service.stream_response = stalling_stream
+        sample_session.state = ConversationState.USERS
+        
+        question = await question_generator._generate_followup(
+            sample_session, "Short answer", []
+        )
+        
+        assert question.text == "Who will use it?"
+        assert closed == [True]
+        mock_llm_service.generate_response.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_llm_fallback_on_error(
         self,
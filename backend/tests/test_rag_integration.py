@@ -130,7 +130,7 @@ class TestRAGPersistence:
         await conversation_service.process_answer(session_id, answer)
         
         # Verify interaction was persisted
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="task management",
             session_id=session_id,
             top_k=5
@@ -158,7 +158,7 @@ class TestRAGPersistence:
             await conversation_service.process_answer(session_id, answer)
         
         # Verify all interactions are retrievable
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="project management developers",
             session_id=session_id,
             top_k=10
@@ -193,7 +193,7 @@ class TestContextRetrieval:
         )
         
         # Verify context exists
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="collaboration",
             session_id=session_id
         )
@@ -308,7 +308,7 @@ class TestConversationFlow:
         assert next_q.is_followup is True
         
         # Context should be available for follow-up
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="task management",
             session_id=session_id
         )
@@ -340,11 +340,11 @@ class TestSessionIsolation:
         )
         
         # Verify contexts are separate
-        context1 = rag_service.retrieve_context(
+        context1 = await rag_service.retrieve_context(
             query="construction",
             session_id=session1_id
         )
-        context2 = rag_service.retrieve_context(
+        context2 = await rag_service.retrieve_context(
             query="fitness",
             session_id=session2_id
         )
@@ -373,7 +373,7 @@ class TestErrorHandling:
         failing_rag.persist_interaction = AsyncMock(
             side_effect=Exception("Database connection failed")
         )
-        failing_rag.retrieve_context = MagicMock(return_value=[])
+        failing_rag.retrieve_context = AsyncMock(return_value=[])
         
         service = ConversationService(
             llm_service=mock_llm_service,
@@ -401,7 +401,7 @@ class TestErrorHandling:
         # Create RAG service with failing retrieval
         failing_rag = MagicMock(spec=RAGService)
         failing_rag.persist_interaction = AsyncMock(return_value=None)
-        failing_rag.retrieve_context = MagicMock(
+        failing_rag.retrieve_context = AsyncMock(
             side_effect=Exception("Vector store unavailable")
         )
         
@@ -446,7 +446,7 @@ class TestQuestionQuality:
         )
         
         # Query for relevant context
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="software development version control",
             session_id=session_id,
             top_k=3
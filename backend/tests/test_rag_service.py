@@ -11,7 +11,9 @@ import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
 
-from services.rag_service import RAGService
+import numpy as np
+
+from services.rag_service import RAGService, BatchingEncoder, EmbeddingCache, QueryCache
 from storage.conversation_storage import ConversationStorage
 
 
@@ -67,9 +69,9 @@ class TestRAGServiceBasics:
         text = "This is a test sentence for embedding."
         embedding = rag_service._embed_text(text)
         
-        assert isinstance(embedding, list)
-        assert len(embedding) == 384  # all-MiniLM-L6-v2 dimension
-        assert all(isinstance(x, float) for x in embedding)
+        assert isinstance(embedding, np.ndarray)
+        assert embedding.shape == (384,)  # all-MiniLM-L6-v2 dimension
+        assert embedding.dtype == np.float32
     
     @pytest.mark.asyncio
     async def test_chunk_separation(self, rag_service):
@@ -119,7 +121,7 @@ class TestContextRetrieval:
         )
         
         # Retrieve context with a related query
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="Tell me about the users",
             session_id=session_id,
             top_k=2
@@ -145,7 +147,7 @@ class TestContextRetrieval:
         )
         
         # Retrieve with small token limit
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="test",
             session_id=session_id,
             max_tokens=500
@@ -169,7 +171,7 @@ class TestContextRetrieval:
             )
         
         # Retrieve context
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="fitness app",
             session_id=session_id,
             top_k=5
@@ -199,7 +201,7 @@ class TestContextRetrieval:
         )
         
         # Retrieve from session 1
-        context_1 = rag_service.retrieve_context(
+        context_1 = await rag_service.retrieve_context(
             query="answer",
             session_id=session_1,
             top_k=10
@@ -255,7 +257,7 @@ class TestCollectionManagement:
         )
         
         # Delete session chunks
-        deleted_count = rag_service.delete_session_chunks(session_id)
+        deleted_count = await rag_service.delete_session_chunks(session_id)
         
         assert deleted_count == 2
         
@@ -311,7 +313,7 @@ class TestPersistence:
         assert stats['session_chunks'] >= 1
         
         # Can retrieve context
-        context = rag2.retrieve_context(
+        context = await rag2.retrieve_context(
             query="answer",
             session_id=session_id
         )
@@ -344,7 +346,7 @@ class TestRecencyWeighting:
         )
         
         # Retrieve with high recency weight
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="topic X",
             session_id=session_id,
             top_k=2,
@@ -361,7 +363,7 @@ class TestEdgeCases:
     @pytest.mark.asyncio
     async def test_retrieve_from_empty_collection(self, rag_service):
         """Test retrieving from empty collection."""
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="test",
             session_id="nonexistent",
             top_k=5
@@ -383,7 +385,7 @@ class TestEdgeCases:
             )
         
         # Should handle retrieval efficiently
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="content",
             session_id=session_id,
             top_k=5
@@ -406,9 +408,115 @@ class TestEdgeCases:
         assert chunk_id is not None
         
         # Retrieve should work
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query="markdown",
             session_id=session_id
         )
         
         assert len(context) > 0
+
+
+class FakeEmbeddingModel:
+    """Minimal stand-in for SentenceTransformer that records batch sizes."""
+    
+    def __init__(self):
+        self.batch_sizes = []
+    
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, **kwargs):
+        self.batch_sizes.append(len(texts))
+        return np.array([[float(len(t)), 1.0] for t in texts])
+
+
+class TestBatchingEncoder:
+    """Test coalescing of concurrent embedding requests."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_encode_calls(self):
+        """Test that concurrent requests are batched and results stay in order."""
+        model = FakeEmbeddingModel()
+        encoder = BatchingEncoder(model, max_batch=32)
+        
+        embeddings = await asyncio.gather(
+            *(encoder.encode("x" * i) for i in range(40))
+        )
+        
+        assert model.batch_sizes == [32, 8]
+        assert [e[0] for e in embeddings] == [float(i) for i in range(40)]
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_batch(self):
+        """Test that cancelling the first caller leaves the rest of its batch intact."""
+        model = FakeEmbeddingModel()
+        encoder = BatchingEncoder(model, max_batch=32, max_wait=0.05)
+        
+        leader = asyncio.create_task(encoder.encode("lead"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(encoder.encode("follower"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        
+        embedding = await follower
+        
+        assert leader.cancelled()
+        assert embedding[0] == float(len("follower"))
+        assert model.batch_sizes == [2]
+
+
+class TestQueryCache:
+    """Test the similarity cache in front of ChromaDB queries."""
+    
+    def test_similar_query_hits_and_invalidation_clears(self):
+        """Test hits for similar queries, misses for other scopes, and invalidation."""
+        cache = QueryCache(threshold=0.95)
+        scope = ("session-1", 5, 4000, 0.3)
+        query = np.array([1.0, 0.0], dtype=np.float32)
+        similar = np.array([0.99, 0.141], dtype=np.float32)
+        different = np.array([0.0, 1.0], dtype=np.float32)
+        
+        assert cache.lookup(scope, query) is None
+        cache.store(scope, query, ["Q: a\nA: b"])
+        
+        assert cache.lookup(scope, similar) == ["Q: a\nA: b"]
+        assert cache.lookup(scope, different) is None
+        assert cache.lookup(("session-2", 5, 4000, 0.3), query) is None
+        
+        cache.invalidate("session-1")
+        assert cache.lookup(scope, query) is None
+    
+    def test_expired_entries_are_not_reused(self):
+        """Test that entries older than the TTL are ignored."""
+        cache = QueryCache(ttl_seconds=0.0)
+        scope = ("session-1", 5, 4000, 0.3)
+        query = np.array([1.0, 0.0], dtype=np.float32)
+        
+        cache.store(scope, query, ["chunk"])
+        
+        assert cache.lookup(scope, query) is None
+
+
+class TestEmbeddingCache:
+    """Test reuse of embeddings for identical text."""
+    
+    def test_identical_text_reuses_embedding(self):
+        """Test hits for the same text, misses for other text, and LRU eviction."""
+        cache = EmbeddingCache(max_entries=2)
+        embedding = np.array([1.0, 0.0], dtype=np.float32)
+        
+        assert cache.get("Q: a\nA: b") is None
+        cache.put("Q: a\nA: b", embedding)
+        
+        assert cache.get("Q: a\nA: b") is embedding
+        assert not embedding.flags.writeable
+        assert cache.get("Q: a\nA: c") is None
+        
+        cache.put("two", np.zeros(2, dtype=np.float32))
+        cache.put("three", np.zeros(2, dtype=np.float32))
+        assert cache.get("Q: a\nA: b") is None
+        assert cache.hits == 1
+    
+    def test_expired_entries_are_not_reused(self):
+        """Test that entries older than the TTL are ignored."""
+        cache = EmbeddingCache(ttl_seconds=0.0)
+        cache.put("text", np.ones(2, dtype=np.float32))
+        
+        assert cache.get("text") is None
@@ -5,6 +5,7 @@ Tests cover:
 - POST /api/session/save endpoint
 - GET /api/session/load/:id endpoint
 - GET /api/session/list endpoint
+- GET /api/session/export/:id endpoint
 - DELETE /api/session/:id endpoint
 - Request/response validation
 - Error handling
@@ -351,6 +352,35 @@ class TestListSessionsEndpoint:
         assert isinstance(data["offset"], int)
 
 
+class TestExportSessionEndpoint:
+    """Test GET /api/session/export/:id endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_export_session_success(self, client, populated_conversation_service, sample_session_id):
+        """Test exporting a session returns its messages as a JSON attachment."""
+        await populated_conversation_service.manual_save_session(sample_session_id)
+        
+        response = client.get(f"/api/session/export/{sample_session_id}")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert "attachment" in response.headers["content-disposition"]
+        data = response.json()
+        assert data["id"] == sample_session_id
+        assert [m["content"] for m in data["messages"]] == [
+            "Welcome message",
+            "What is your product?",
+            "A task management app"
+        ]
+    
+    def test_export_session_not_found(self, client):
+        """Test exporting non-existent session returns 404."""
+        response = client.get("/api/session/export/nonexistent-session")
+        
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"].lower()
+
+
 class TestDeleteSessionEndpoint:
     """Test DELETE /api/session/:id endpoint."""
     
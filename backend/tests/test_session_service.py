@@ -14,6 +14,7 @@ Tests cover:
 import pytest
 import asyncio
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 from typing import List
@@ -131,8 +132,12 @@ class TestSaveSession:
         assert data['model_id'] == sample_session.model_id
         assert 'started_at' in data
         assert 'last_updated' in data
-        assert 'messages' in data
-        assert len(data['messages']) == len(sample_messages)
+        assert 'messages' not in data
+        
+        # Messages are stored one per line in the session's message log
+        log_path = session_service.base_dir / f"{sample_session.id}.jsonl"
+        records = [json.loads(line) for line in log_path.read_text().splitlines()]
+        assert [r['id'] for r in records] == [m.id for m in sample_messages]
     
     @pytest.mark.asyncio
     async def test_save_session_includes_metadata(self, session_service, sample_session, sample_messages):
@@ -185,6 +190,47 @@ class TestSaveSession:
         assert data['state'] == ConversationState.COMPLETE.value
 
 
+    @pytest.mark.asyncio
+    async def test_save_session_skips_unchanged_content(self, session_service, sample_session, sample_messages):
+        """Test that re-saving an unchanged session does not rewrite the file."""
+        await session_service.save_session(sample_session, sample_messages)
+        filepath = session_service.base_dir / f"{sample_session.id}.json"
+        first_saved = filepath.read_bytes()
+        first_updated = sample_session.last_updated
+        
+        await asyncio.sleep(0.01)
+        assert await session_service.save_session(sample_session, sample_messages) is True
+        
+        assert filepath.read_bytes() == first_saved
+        assert sample_session.last_updated == first_updated
+        assert not filepath.with_suffix('.json.tmp').exists()
+        
+        # A new message changes the content, so the file is rewritten
+        await session_service.save_session(sample_session, sample_messages + [
+            Message(session_id=sample_session.id, role=MessageRole.USER, content="More detail")
+        ])
+        assert filepath.read_bytes() != first_saved
+
+    
+    @pytest.mark.asyncio
+    async def test_save_session_compact_by_default(self, session_service, sample_session, sample_messages):
+        """Test that session files are compact unless pretty output is requested."""
+        await session_service.save_session(sample_session, sample_messages)
+        filepath = session_service.base_dir / f"{sample_session.id}.json"
+        
+        # Header line plus a single-line body
+        assert len(filepath.read_text().splitlines()) == 2
+        
+        sample_session.metadata["note"] = "pretty"
+        await session_service.save_session(sample_session, sample_messages, pretty=True)
+        assert len(filepath.read_text().splitlines()) > 2
+        
+        sessions = await session_service.list_sessions()
+        assert sessions[0]['id'] == sample_session.id
+        loaded_session, _ = await session_service.load_session(sample_session.id)
+        assert loaded_session.metadata["note"] == "pretty"
+
+
 class TestLoadSession:
     """Test session loading functionality."""
     
@@ -233,6 +279,61 @@ class TestLoadSession:
             assert loaded.role == original.role
             assert loaded.content == original.content
             assert loaded.metadata == original.metadata
+            assert loaded.timestamp == original.timestamp
+    
+    @pytest.mark.asyncio
+    async def test_message_timestamps_stored_as_epoch_ms(self, session_service, sample_session, sample_messages):
+        """Test that message timestamps are saved as epoch milliseconds."""
+        await session_service.save_session(sample_session, sample_messages)
+        
+        log_path = session_service.base_dir / f"{sample_session.id}.jsonl"
+        first_record = json.loads(log_path.read_text().splitlines()[0])
+        
+        assert first_record['timestamp'] == 1704110400000  # 2024-01-01T12:00:00Z
+    
+    @pytest.mark.asyncio
+    async def test_load_legacy_session_with_embedded_messages(self, session_service, sample_session, sample_messages):
+        """Test that files with embedded, ISO-timestamped messages and no log still load."""
+        await session_service.save_session(sample_session, sample_messages)
+        
+        filepath = session_service.base_dir / f"{sample_session.id}.json"
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        data['messages'] = [
+            {
+                'id': msg.id,
+                'session_id': msg.session_id,
+                'role': msg.role.value,
+                'content': msg.content,
+                'timestamp': msg.timestamp.isoformat(),
+                'metadata': msg.metadata
+            }
+            for msg in sample_messages
+        ]
+        with open(filepath, 'w') as f:
+            json.dump(data, f)
+        (session_service.base_dir / f"{sample_session.id}.jsonl").unlink()
+        
+        _, loaded_messages = await session_service.load_session(sample_session.id)
+        
+        assert [m.id for m in loaded_messages] == [m.id for m in sample_messages]
+        assert [m.timestamp for m in loaded_messages] == [m.timestamp for m in sample_messages]
+    
+    @pytest.mark.asyncio
+    async def test_saves_append_new_and_edited_messages(self, session_service, sample_session, sample_messages):
+        """Test that later saves append only changed messages and edits win on load."""
+        await session_service.save_session(sample_session, sample_messages[:3])
+        log_path = session_service.base_dir / f"{sample_session.id}.jsonl"
+        assert len(log_path.read_text().splitlines()) == 3
+        
+        sample_messages[1].content = "Edited answer"
+        await session_service.save_session(sample_session, sample_messages)
+        assert len(log_path.read_text().splitlines()) == 6  # 1 edit + 2 new
+        
+        _, loaded_messages = await session_service.load_session(sample_session.id)
+        
+        assert [m.id for m in loaded_messages] == [m.id for m in sample_messages]
+        assert loaded_messages[1].content == "Edited answer"
     
     @pytest.mark.asyncio
     async def test_load_nonexistent_session_returns_none(self, session_service):
@@ -252,6 +353,20 @@ class TestLoadSession:
         
         assert loaded_session.skipped_questions == ["q-001", "q-003"]
 
+    
+    @pytest.mark.asyncio
+    async def test_export_session_embeds_messages(self, session_service, sample_session, sample_messages):
+        """Test that an export is an indented JSON document with its messages."""
+        await session_service.save_session(sample_session, sample_messages)
+        
+        exported = await session_service.export_session(sample_session.id)
+        
+        assert exported.startswith(b'{\n  "id"')
+        data = json.loads(exported)
+        assert data['id'] == sample_session.id
+        assert [m['id'] for m in data['messages']] == [m.id for m in sample_messages]
+        assert await session_service.export_session("missing-session") is None
+
 
 class TestListSessions:
     """Test session listing functionality."""
@@ -281,6 +396,22 @@ class TestListSessions:
         assert session_info['question_count'] == 3  # 1 system + 2 assistant messages
         assert session_info['message_count'] == 5
     
+    @pytest.mark.asyncio
+    async def test_list_sessions_reads_files_without_header(self, session_service, sample_session, sample_messages):
+        """Test that session files saved without a summary header are still listed."""
+        await session_service.save_session(sample_session, sample_messages)
+        
+        filepath = session_service.base_dir / f"{sample_session.id}.json"
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        header = data.pop('__header__')
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2)
+        
+        sessions = await session_service.list_sessions()
+        
+        assert sessions == [header]
+    
     @pytest.mark.asyncio
     async def test_list_sessions_sorted_by_last_updated(self, session_service, sample_messages):
         """Test that sessions are sorted by last_updated (most recent first)."""
@@ -326,6 +457,48 @@ class TestListSessions:
         sessions = await session_service.list_sessions(offset=2)
         
         assert len(sessions) == 3  # 5 total - 2 offset = 3
+    
+    @pytest.mark.asyncio
+    async def test_list_sessions_reuses_cached_summaries(self, session_service, sample_session, sample_messages, monkeypatch):
+        """Test that unchanged session files are not re-read on later listings."""
+        await session_service.save_session(sample_session, sample_messages)
+        
+        reads = []
+        original_read = session_service._read_session_summary
+        
+        def counting_read(filepath):
+            reads.append(filepath)
+            return original_read(filepath)
+        
+        monkeypatch.setattr(session_service, "_read_session_summary", counting_read)
+        
+        first = await session_service.list_sessions()
+        second = await session_service.list_sessions()
+        assert first == second
+        assert len(reads) == 1
+        
+        sample_session.status = "complete"
+        await session_service.save_session(sample_session, sample_messages)
+        third = await session_service.list_sessions()
+        
+        assert third[0]['status'] == "complete"
+        assert len(reads) == 2
+    
+    @pytest.mark.asyncio
+    async def test_list_sessions_with_cursor(self, session_service, sample_messages):
+        """Test cursor paging continues after the given session, newest first."""
+        for i in range(5):
+            session = Session(id=f"session-{i}")
+            await session_service.save_session(session, sample_messages[:1])
+            # Distinct save times regardless of filesystem timestamp resolution
+            filepath = session_service.base_dir / f"session-{i}.json"
+            os.utime(filepath, ns=(i * 10**9, i * 10**9))
+        
+        first_page = await session_service.list_sessions(limit=2)
+        second_page = await session_service.list_sessions(limit=2, cursor=first_page[-1]['id'])
+        
+        assert [s['id'] for s in first_page] == ['session-4', 'session-3']
+        assert [s['id'] for s in second_page] == ['session-2', 'session-1']
 
 
 class TestDeleteSession:
@@ -492,6 +665,35 @@ class TestConcurrentAccess:
         assert all(result is not None for result in results)
         assert len(results) == 3
 
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_share_write_batches(self, session_service, sample_messages, monkeypatch):
+        """Test that writes from concurrent saves are group-committed."""
+        import services.session_service as session_module
+        
+        batch_sizes = []
+        write_batch = session_module._write_batch
+        
+        def recording_write_batch(batch):
+            batch_sizes.append(len(batch))
+            return write_batch(batch)
+        
+        monkeypatch.setattr(session_module, "_write_batch", recording_write_batch)
+        
+        sessions = [Session(id=f"batched-{i}") for i in range(5)]
+        results = await asyncio.gather(*[
+            session_service.save_session(session, sample_messages)
+            for session in sessions
+        ])
+        
+        assert all(results)
+        # Two writes per save (message log, then session file), fewer batches
+        assert sum(batch_sizes) == 2 * len(sessions)
+        assert len(batch_sizes) < 2 * len(sessions)
+        for session in sessions:
+            loaded_session, loaded_messages = await session_service.load_session(session.id)
+            assert len(loaded_messages) == len(sample_messages)
+
 
 class TestErrorHandling:
     """Test error handling and edge cases."""
@@ -290,7 +290,7 @@ class TestRAGIntegration:
         assert success is True
         
         # Retrieve context and verify new answer is present
-        context = rag_service.retrieve_context(
+        context = await rag_service.retrieve_context(
             query=new_answer,
             session_id=session_id,
             top_k=5